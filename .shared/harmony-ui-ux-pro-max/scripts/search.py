@@ -5,69 +5,656 @@ HarmonyOS NEXT UI/UX Pro Max Skill - Search Script
 Provides design intelligence search for HarmonyOS NEXT UI/UX development.
 """
 
-import os
+import time
+
+# Captured before any other import so --profile can report startup cost
+_PROCESS_TIME_AT_START = time.process_time()
+_MODULE_START = time.perf_counter()
+
 import sys
-import json
-import csv
 import argparse
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple, NamedTuple
+
+# json, csv, hashlib and tracemalloc are imported where they are used so that
+# a plain single-domain query only pays for what it needs at startup.
+
+_IMPORT_TIME = time.perf_counter() - _MODULE_START
 
 # Get the script directory
 SCRIPT_DIR = Path(__file__).parent
 KNOWLEDGE_BASE_DIR = SCRIPT_DIR.parent.parent.parent / "knowledge_base"
 SHARED_DIR = SCRIPT_DIR.parent
 
+# ArkTS resource files emitted alongside MASTER.md (relative to the resources dir)
+RESOURCE_COLOR_FILE = Path("base") / "element" / "color.json"
+RESOURCE_DARK_COLOR_FILE = Path("dark") / "element" / "color.json"
+RESOURCE_FLOAT_FILE = Path("base") / "element" / "float.json"
+
+# Knowledge tables and their CSV files
+KNOWLEDGE_FILES = {
+    "components": "components.csv",
+    "layouts": "layouts.csv",
+    "colors": "colors.csv",
+    "typography": "typography.csv",
+    "spacing": "spacing.csv",
+    "animations": "animations.csv",
+    "page_templates": "page_templates.csv",
+    "arkui_patterns": "arkui_patterns.csv",
+    "navigation_patterns": "navigation_patterns.csv",
+    "code_snippets": "code_snippets.csv",
+    "scraped_knowledge": "scraped_knowledge.csv",
+}
+
+# Full article bodies of scraped_knowledge rows (gzip JSON keyed by content_ref),
+# read only for the rows a search returns
+ARTICLE_CONTENT_DIR = KNOWLEDGE_BASE_DIR / "content"
 
-@dataclass
-class SearchResult:
+# Tables linked by the related-item graph:
+# table -> (node kind, name column, column listing the components it uses)
+RELATED_SOURCES = {
+    "page_templates": ("page_template", "name", "components_used"),
+    "arkui_patterns": ("pattern", "pattern_name", "components_used"),
+    "navigation_patterns": ("navigation_pattern", "pattern_name", "components_used"),
+    "code_snippets": ("snippet", "snippet_name", "component_type"),
+}
+
+# Precomputed related-item graph, rebuilt when any source CSV changes
+RELATED_INDEX_FILE = SHARED_DIR / ".cache" / "related_index.json"
+
+# SQLite/FTS5 compilation of knowledge_base/*.csv for --backend sqlite
+SQLITE_DB_FILE = SHARED_DIR / ".cache" / "knowledge.sqlite3"
+
+# Columns whose values are all at most this long get a B-tree index
+SQLITE_INDEX_MAX_LENGTH = 64
+
+
+class SearchResult(NamedTuple):
     """Search result item"""
     category: str
     title: str
     content: str
     relevance: float
+    ref: str = ""  # content_ref of a scraped article, resolved after ranking
 
 
-class HarmonyDesignSearch:
-    """HarmonyOS NEXT Design Intelligence Search"""
+class _NullStage:
+    """No-op stage used when profiling is disabled"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _ProfileStage:
+    """A single timed stage of a QueryProfiler"""
+    
+    def __init__(self, profiler: "QueryProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+    
+    def __enter__(self):
+        tracemalloc = self.profiler.tracemalloc
+        self.blocks_before = self.profiler._traced_blocks()
+        self.memory_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        memory_after, peak = self.profiler.tracemalloc.get_traced_memory()
+        blocks_after = self.profiler._traced_blocks()
+        entry = self.profiler.stages.setdefault(self.name, {
+            "ms": 0.0, "calls": 0, "blocks": 0, "bytes": 0, "peak": 0
+        })
+        entry["ms"] += elapsed * 1000
+        entry["calls"] += 1
+        entry["blocks"] += blocks_after - self.blocks_before
+        entry["bytes"] += memory_after - self.memory_before
+        entry["peak"] = max(entry["peak"], peak - self.memory_before)
+        return False
+
+
+class QueryProfiler:
+    """Per-stage timing and tracemalloc allocation stats for --profile"""
     
     def __init__(self):
-        self.knowledge = self._load_knowledge()
-    
-    def _load_knowledge(self) -> Dict:
-        """Load knowledge from CSV files"""
-        knowledge = {
-            "components": [],
-            "layouts": [],
-            "colors": [],
-            "typography": [],
-            "spacing": [],
-            "animations": [],
-            "page_templates": []
-        }
+        import tracemalloc
         
-        # Load from CSV files if they exist
-        csv_files = {
-            "components": KNOWLEDGE_BASE_DIR / "components.csv",
-            "layouts": KNOWLEDGE_BASE_DIR / "layouts.csv",
-            "colors": KNOWLEDGE_BASE_DIR / "colors.csv",
-            "typography": KNOWLEDGE_BASE_DIR / "typography.csv",
-            "spacing": KNOWLEDGE_BASE_DIR / "spacing.csv",
-            "animations": KNOWLEDGE_BASE_DIR / "animations.csv",
-            "page_templates": KNOWLEDGE_BASE_DIR / "page_templates.csv"
-        }
+        self.tracemalloc = tracemalloc
+        self.stages: Dict[str, Dict[str, float]] = {}
+        tracemalloc.start()
+    
+    def _traced_blocks(self) -> int:
+        """Number of memory blocks currently traced by tracemalloc"""
+        snapshot = self.tracemalloc.take_snapshot()
+        return sum(stat.count for stat in snapshot.statistics("filename"))
+    
+    def stage(self, name: str) -> _ProfileStage:
+        """Time a stage; repeated stages with the same name are accumulated"""
+        return _ProfileStage(self, name)
+    
+    def report(self) -> str:
+        """Format the collected stages as a text table"""
+        lines = []
+        lines.append(f"{'Stage':<28} {'Calls':>5} {'Time (ms)':>10} {'Blocks':>8} {'Net KiB':>9} {'Peak KiB':>9}")
+        lines.append("-" * 74)
+        lines.append(f"{'interpreter (cpu)':<28} {1:>5} {_PROCESS_TIME_AT_START * 1000:>10.2f}")
+        lines.append(f"{'imports':<28} {1:>5} {_IMPORT_TIME * 1000:>10.2f}")
+        for name, entry in self.stages.items():
+            lines.append(
+                f"{name:<28} {entry['calls']:>5} {entry['ms']:>10.2f} {entry['blocks']:>8} "
+                f"{entry['bytes'] / 1024:>9.1f} {entry['peak'] / 1024:>9.1f}"
+            )
+        total = sum(entry["ms"] for entry in self.stages.values())
+        lines.append("-" * 74)
+        lines.append(f"{'total (excl. startup)':<28} {'':>5} {total:>10.2f}")
+        return "\n".join(lines)
+
+
+class KnowledgeBase:
+    """
+    Knowledge tables loaded lazily from CSV on first access
+    
+    One-shot CLI calls only pay for the tables they query. Long-lived hosts
+    can call prefetch() to load the remaining tables on a background thread
+    pool; concurrent access to a table that is still loading waits for it.
+    """
+    
+    def __init__(self, stage=None):
+        """
+        Args:
+            stage: Optional profiling stage factory (name -> context manager)
+        """
+        self._tables: Dict[str, List[Dict]] = {}
+        self._locks = None
+        self._stage = stage
+    
+    def __getitem__(self, key: str) -> List[Dict]:
+        return self.load(key)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in KNOWLEDGE_FILES
+    
+    def keys(self):
+        return KNOWLEDGE_FILES.keys()
+    
+    def is_loaded(self, key: str) -> bool:
+        """Whether a table has already been loaded"""
+        return key in self._tables
+    
+    def load(self, key: str, profile: bool = True) -> List[Dict]:
+        """
+        Return a table, loading it from CSV if needed
         
-        for key, filepath in csv_files.items():
-            if filepath.exists():
+        Args:
+            key: Table name (see KNOWLEDGE_FILES)
+            profile: Record the load as a profiling stage
+        
+        Returns:
+            Table rows
+        """
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+        if self._locks is None:
+            return self._load(key, profile)
+        with self._locks[key]:
+            table = self._tables.get(key)
+            if table is None:
+                table = self._load(key, profile)
+            return table
+    
+    def _load(self, key: str, profile: bool) -> List[Dict]:
+        """Read a table and remember it"""
+        rows = []
+        source = self._source_name(key)
+        if source:
+            stage = self._stage(f"load {source}") if profile and self._stage else _NULL_STAGE
+            try:
+                with stage:
+                    rows = self._read(key)
+            except Exception as e:
+                print(f"Warning: Failed to load {source}: {e}", file=sys.stderr)
+        
+        self._tables[key] = rows
+        return rows
+    
+    def _source_name(self, key: str) -> Optional[str]:
+        """Name of the table's source, or None if it does not exist"""
+        filepath = KNOWLEDGE_BASE_DIR / KNOWLEDGE_FILES[key]
+        return filepath.name if filepath.exists() else None
+    
+    def _read(self, key: str) -> List[Dict]:
+        """Read a table from its CSV file"""
+        import csv
+        
+        with open(KNOWLEDGE_BASE_DIR / KNOWLEDGE_FILES[key], 'r', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            return list(reader)
+    
+    def prefetch(self, max_workers: int = 2) -> list:
+        """
+        Load all tables not yet loaded on a background thread pool
+        
+        Must be called before the knowledge base is shared across threads.
+        
+        Args:
+            max_workers: Number of loader threads
+        
+        Returns:
+            Futures for the scheduled loads
+        """
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if self._locks is None:
+            self._locks = {key: threading.Lock() for key in KNOWLEDGE_FILES}
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="knowledge-prefetch")
+        futures = [
+            executor.submit(self.load, key, False)
+            for key in KNOWLEDGE_FILES if not self.is_loaded(key)
+        ]
+        executor.shutdown(wait=False)
+        return futures
+
+
+class SqliteKnowledgeStore:
+    """
+    All knowledge_base/*.csv files compiled into one SQLite database
+    
+    Each CSV becomes a table of the same name plus an external-content FTS5
+    table ("<name>_fts", trigram tokenizer so CJK text matches by substring)
+    and B-tree indexes on its short key columns. The database is rebuilt when
+    any CSV changes and opened read-only, one connection per thread, so
+    concurrent readers never block each other.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: Path):
+        import threading
+        
+        self.path = path
+        self._local = threading.local()
+        self._columns: Dict[str, List[str]] = {}
+        self.tokenizer = ""
+        meta = dict(self._connection().execute("SELECT key, value FROM meta"))
+        self.tokenizer = meta.get("tokenizer", "")
+        for table, columns in self._connection().execute("SELECT name, columns FROM tables"):
+            self._columns[table] = columns.split(",")
+    
+    @staticmethod
+    def source_signature() -> str:
+        """Signature of all knowledge CSV files (name + mtime + size)"""
+        parts = []
+        for filepath in sorted(KNOWLEDGE_BASE_DIR.glob("*.csv")):
+            stat = filepath.stat()
+            parts.append(f"{filepath.name}:{stat.st_mtime_ns}:{stat.st_size}")
+        return f"v{SqliteKnowledgeStore.VERSION}|" + "|".join(parts)
+    
+    @classmethod
+    def open(cls, path: Path = SQLITE_DB_FILE) -> "SqliteKnowledgeStore":
+        """Open the database, (re)building it first if missing or stale"""
+        import sqlite3
+        
+        signature = cls.source_signature()
+        current = None
+        if path.exists():
+            try:
+                conn = sqlite3.connect(path)
                 try:
-                    with open(filepath, 'r', encoding='utf-8-sig') as f:
-                        reader = csv.DictReader(f)
-                        knowledge[key] = list(reader)
-                except Exception as e:
-                    print(f"Warning: Failed to load {filepath}: {e}", file=sys.stderr)
+                    row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+                    current = row[0] if row else None
+                finally:
+                    conn.close()
+            except sqlite3.Error:
+                current = None
+        if current != signature:
+            cls.build(path, signature)
+        return cls(path)
+    
+    @staticmethod
+    def build(path: Path, signature: str) -> None:
+        """Compile every knowledge CSV into a fresh database at path"""
+        import csv
+        import os
+        import sqlite3
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE TABLE tables (name TEXT PRIMARY KEY, columns TEXT)")
+            tokenizer = None
+            
+            for filepath in sorted(KNOWLEDGE_BASE_DIR.glob("*.csv")):
+                table = filepath.stem
+                with open(filepath, 'r', encoding='utf-8-sig') as f:
+                    reader = csv.DictReader(f)
+                    columns = [c.strip() for c in (reader.fieldnames or []) if c and c.strip()]
+                    rows = [[row.get(c) for c in columns] for row in reader]
+                if not columns:
+                    continue
+                
+                quoted = ", ".join(f'"{c}"' for c in columns)
+                column_defs = ", ".join(f'"{c}" TEXT' for c in columns)
+                conn.execute(f'CREATE TABLE "{table}" ({column_defs})')
+                conn.executemany(
+                    f'INSERT INTO "{table}" ({quoted}) VALUES ({", ".join("?" for _ in columns)})', rows
+                )
+                conn.execute("INSERT INTO tables (name, columns) VALUES (?, ?)", (table, ",".join(columns)))
+                
+                # Trigram matches CJK substrings; fall back to unicode61 on old SQLite builds
+                for candidate in ([tokenizer] if tokenizer else ["trigram", "unicode61"]):
+                    try:
+                        conn.execute(
+                            f'CREATE VIRTUAL TABLE "{table}_fts" USING fts5({quoted}, '
+                            f"content='{table}', content_rowid='rowid', tokenize='{candidate}')"
+                        )
+                        tokenizer = candidate
+                        break
+                    except sqlite3.OperationalError:
+                        continue
+                else:
+                    raise RuntimeError("SQLite FTS5 is not available in this Python build")
+                conn.execute(f'INSERT INTO "{table}_fts" ("{table}_fts") VALUES (\'rebuild\')')
+                
+                for i, column in enumerate(columns):
+                    if all(len(row[i] or "") <= SQLITE_INDEX_MAX_LENGTH for row in rows):
+                        conn.execute(f'CREATE INDEX "idx_{table}_{column}" ON "{table}" ("{column}")')
+            
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+                ("signature", signature),
+                ("tokenizer", tokenizer or ""),
+            ])
+            conn.commit()
+        finally:
+            conn.close()
+        
+        os.replace(tmp_path, path)
+    
+    def _connection(self):
+        """Read-only connection for the calling thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import sqlite3
+            
+            conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+    
+    def has_table(self, table: str) -> bool:
+        return table in self._columns
+    
+    def rows(self, table: str) -> List[Dict]:
+        """All rows of a table, in CSV order"""
+        cursor = self._connection().execute(f'SELECT * FROM "{table}" ORDER BY rowid')
+        return [dict(row) for row in cursor]
+    
+    def candidates(self, table: str, terms: List[str], columns: Tuple[str, ...]) -> List[Dict]:
+        """
+        Rows where any term occurs (case-insensitively) in any of the columns
+        
+        Terms of three or more characters go through the FTS5 index; shorter
+        terms, which a trigram index cannot match, use LIKE on the base table.
+        """
+        columns = [c for c in columns if c in self._columns.get(table, [])]
+        terms = [t for t in terms if t]
+        if not columns or not terms:
+            return []
+        
+        conditions = []
+        params = []
+        for term in terms:
+            if self.tokenizer == "trigram" and len(term) >= 3:
+                phrase = term.replace('"', '""')
+                conditions.append(f'rowid IN (SELECT rowid FROM "{table}_fts" WHERE "{table}_fts" MATCH ?)')
+                params.append(f'{{{" ".join(columns)}}} : "{phrase}"')
+            else:
+                pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                for column in columns:
+                    conditions.append(f'"{column}" LIKE ? ESCAPE \'\\\'')
+                    params.append(pattern)
+        
+        sql = f'SELECT * FROM "{table}" WHERE {" OR ".join(conditions)} ORDER BY rowid'
+        return [dict(row) for row in self._connection().execute(sql, params)]
+
+
+class SqliteKnowledgeBase(KnowledgeBase):
+    """KnowledgeBase whose tables are read from a SqliteKnowledgeStore"""
+    
+    def __init__(self, store: SqliteKnowledgeStore, stage=None):
+        super().__init__(stage=stage)
+        self.store = store
+    
+    def _source_name(self, key: str) -> Optional[str]:
+        return f"{key} (sqlite)" if self.store.has_table(key) else None
+    
+    def _read(self, key: str) -> List[Dict]:
+        return self.store.rows(key)
+
+
+class RelatedIndex:
+    """
+    Precomputed adjacency index linking templates, patterns, components and snippets
+    
+    Each node stores its display content and a precomputed "bundle" of related
+    nodes, so "what goes with this" is one dict lookup instead of N searches:
+    
+    - page templates / patterns: the components they use, plus the code
+      snippets for those components
+    - components: the templates, patterns and snippets that use them
+    - snippets: the component they implement
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, nodes: Dict[str, Dict], bundles: Dict[str, List[List]], signature: str = ""):
+        """
+        Args:
+            nodes: Node key ("kind:name") -> {"kind", "name", "content"}
+            bundles: Node key -> [[related node key, hops], ...]
+            signature: Source CSV signature the index was built from
+        """
+        self.nodes = nodes
+        self.bundles = bundles
+        self.signature = signature
+        self.names: Dict[str, List[str]] = {}
+        for key, node in nodes.items():
+            self.names.setdefault(node["name"].lower(), []).append(key)
+    
+    @staticmethod
+    def source_signature() -> str:
+        """Signature of the CSV files the index is built from (mtime + size)"""
+        parts = []
+        for table in ["components", *RELATED_SOURCES]:
+            filepath = KNOWLEDGE_BASE_DIR / KNOWLEDGE_FILES[table]
+            try:
+                stat = filepath.stat()
+                parts.append(f"{table}:{stat.st_mtime_ns}:{stat.st_size}")
+            except OSError:
+                parts.append(f"{table}:missing")
+        return f"v{RelatedIndex.VERSION}|" + "|".join(parts)
+    
+    @classmethod
+    def build(cls, knowledge: "KnowledgeBase", signature: str = "") -> "RelatedIndex":
+        """Build the index from the knowledge tables"""
+        nodes: Dict[str, Dict] = {}
+        edges: Dict[str, List[str]] = {}
+        
+        def add_node(kind: str, name: str, content: str) -> str:
+            key = f"{kind}:{name}"
+            if key not in nodes or content:
+                nodes[key] = {"kind": kind, "name": name, "content": content}
+            edges.setdefault(key, [])
+            return key
+        
+        def link(a: str, b: str):
+            if b not in edges[a]:
+                edges[a].append(b)
+            if a not in edges[b]:
+                edges[b].append(a)
+        
+        for comp in knowledge["components"]:
+            if comp.get("name"):
+                add_node("component", comp["name"],
+                         f"{comp.get('description', '')}\n\nUsage:\n{comp.get('usage_example', '')}")
         
-        return knowledge
+        for table, (kind, name_column, components_column) in RELATED_SOURCES.items():
+            for row in knowledge[table]:
+                name = row.get(name_column, "")
+                if not name:
+                    continue
+                if kind == "page_template":
+                    content = f"{row.get('description', '')}\n\nComponents: {row.get('components_used', '')}\n\nStructure:\n{row.get('layout_structure', '')}"
+                elif kind == "snippet":
+                    content = f"{row.get('description', '')}\n\nCode:\n{row.get('code_pattern', '')}"
+                else:
+                    content = f"{row.get('description', '')}\n\nCode:\n{row.get('code_example', '')}"
+                key = add_node(kind, name, content)
+                for comp_name in row.get(components_column, "").split(","):
+                    comp_name = comp_name.strip()
+                    if comp_name:
+                        comp_key = f"component:{comp_name}"
+                        if comp_key not in nodes:
+                            add_node("component", comp_name, "")
+                        link(key, comp_key)
+        
+        bundles: Dict[str, List[List]] = {}
+        for key, neighbours in edges.items():
+            bundle = [[neighbour, 1] for neighbour in neighbours]
+            if nodes[key]["kind"] in ("page_template", "pattern", "navigation_pattern"):
+                seen = {key, *neighbours}
+                for comp_key in neighbours:
+                    for second in edges[comp_key]:
+                        if second not in seen and nodes[second]["kind"] == "snippet":
+                            seen.add(second)
+                            bundle.append([second, 2])
+            bundles[key] = bundle
+        
+        return cls(nodes, bundles, signature)
+    
+    @classmethod
+    def load(cls, path: Path, signature: str) -> Optional["RelatedIndex"]:
+        """Load a persisted index, or None if missing or stale"""
+        import json
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("signature") != signature:
+            return None
+        return cls(data["nodes"], data["bundles"], signature)
+    
+    def save(self, path: Path) -> None:
+        """Persist the index as JSON"""
+        import json
+        
+        content = json.dumps({
+            "signature": self.signature,
+            "nodes": self.nodes,
+            "bundles": self.bundles,
+        }, ensure_ascii=False)
+        try:
+            write_if_changed(path, content)
+        except OSError as e:
+            print(f"Warning: Failed to save related index {path}: {e}", file=sys.stderr)
+    
+    def lookup(self, name: str) -> List[SearchResult]:
+        """
+        Find nodes by name and return them with their related bundle
+        
+        Exact (case-insensitive) name matches win; otherwise names containing
+        the query are used.
+        """
+        name_lower = name.lower().strip()
+        keys = self.names.get(name_lower)
+        if not keys:
+            keys = [key for node_name, node_keys in self.names.items()
+                    if name_lower in node_name for key in node_keys]
+        
+        results = []
+        seen = set()
+        for key in keys:
+            for related_key, hops in [[key, 0]] + self.bundles.get(key, []):
+                if related_key in seen:
+                    continue
+                seen.add(related_key)
+                node = self.nodes[related_key]
+                results.append(SearchResult(
+                    category=node["kind"],
+                    title=node["name"],
+                    content=node["content"],
+                    relevance=3.0 - hops
+                ))
+        return results
+
+
+class HarmonyDesignSearch:
+    """HarmonyOS NEXT Design Intelligence Search"""
+    
+    def __init__(self, profiler: Optional[QueryProfiler] = None, prefetch: bool = False,
+                 backend: str = "memory"):
+        """
+        Args:
+            profiler: Optional profiler collecting per-stage stats
+            prefetch: Load all knowledge tables in the background (for long-lived hosts)
+            backend: "memory" (scan CSV tables) or "sqlite" (SQLite FTS5 database)
+        """
+        self.profiler = profiler
+        self.store: Optional[SqliteKnowledgeStore] = None
+        stage = self._stage if profiler is not None else None
+        if backend == "sqlite":
+            with self._stage(f"open {SQLITE_DB_FILE.name}"):
+                self.store = SqliteKnowledgeStore.open(SQLITE_DB_FILE)
+            self.knowledge: KnowledgeBase = SqliteKnowledgeBase(self.store, stage=stage)
+        elif backend == "memory":
+            self.knowledge = KnowledgeBase(stage=stage)
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+        self._related_index: Optional[RelatedIndex] = None
+        if prefetch:
+            self.knowledge.prefetch()
+    
+    def _stage(self, name: str):
+        """Profiling context for a stage (no-op unless profiling)"""
+        if self.profiler is None:
+            return _NULL_STAGE
+        return self.profiler.stage(name)
+    
+    def _table(self, key: str) -> List[Dict]:
+        """Load a knowledge table on first use, then look it up"""
+        self.knowledge.load(key)
+        with self._stage("lookup"):
+            return self.knowledge[key]
+    
+    def _candidates(self, key: str, query: str, *columns: str) -> List[Dict]:
+        """
+        Rows of a table that may match the query
+        
+        The memory backend returns the whole table; the SQLite backend narrows
+        it with the FTS index to rows containing a query term in one of the
+        columns. Either way the rows are then scored identically.
+        """
+        if self.store is None:
+            return self._table(key)
+        with self._stage("lookup"):
+            return self.store.candidates(key, query.split(), columns)
     
     def search(self, query: str, domain: str = "all") -> List[SearchResult]:
         """
@@ -75,7 +662,8 @@ class HarmonyDesignSearch:
         
         Args:
             query: Search query
-            domain: Search domain (all, component, layout, style, animation)
+            domain: Search domain (all, component, layout, style, color, typography,
+                template, or article for scraped community articles)
         
         Returns:
             List of search results
@@ -85,68 +673,134 @@ class HarmonyDesignSearch:
         
         # Search components
         if domain in ["all", "component"]:
-            for comp in self.knowledge["components"]:
-                score = self._calculate_relevance(query_lower, comp.get("name", ""), comp.get("description", ""))
-                if score > 0:
-                    results.append(SearchResult(
-                        category="component",
-                        title=comp.get("name", ""),
-                        content=f"{comp.get('description', '')}\n\nUsage:\n{comp.get('usage_example', '')}",
-                        relevance=score
-                    ))
+            rows = self._candidates("components", query_lower, "name", "description")
+            with self._stage("scoring"):
+                for comp in rows:
+                    score = self._calculate_relevance(query_lower, comp.get("name", ""), comp.get("description", ""))
+                    if score > 0:
+                        results.append(SearchResult(
+                            category="component",
+                            title=comp.get("name", ""),
+                            content=f"{comp.get('description', '')}\n\nUsage:\n{comp.get('usage_example', '')}",
+                            relevance=score
+                        ))
         
         # Search layouts
         if domain in ["all", "layout"]:
-            for layout in self.knowledge["layouts"]:
-                score = self._calculate_relevance(query_lower, layout.get("name", ""), layout.get("description", ""))
-                if score > 0:
-                    results.append(SearchResult(
-                        category="layout",
-                        title=layout.get("name", ""),
-                        content=f"{layout.get('description', '')}\n\nCode:\n{layout.get('code_example', '')}",
-                        relevance=score
-                    ))
+            rows = self._candidates("layouts", query_lower, "name", "description")
+            with self._stage("scoring"):
+                for layout in rows:
+                    score = self._calculate_relevance(query_lower, layout.get("name", ""), layout.get("description", ""))
+                    if score > 0:
+                        results.append(SearchResult(
+                            category="layout",
+                            title=layout.get("name", ""),
+                            content=f"{layout.get('description', '')}\n\nCode:\n{layout.get('code_example', '')}",
+                            relevance=score
+                        ))
         
         # Search colors
         if domain in ["all", "style", "color"]:
-            for color in self.knowledge["colors"]:
-                score = self._calculate_relevance(query_lower, color.get("name", ""), color.get("usage", ""))
-                if score > 0:
-                    results.append(SearchResult(
-                        category="color",
-                        title=f"{color.get('name', '')} ({color.get('value', '')})",
-                        content=f"Usage: {color.get('usage', '')}\nLight: {color.get('light_mode', '')}\nDark: {color.get('dark_mode', '')}",
-                        relevance=score
-                    ))
+            rows = self._candidates("colors", query_lower, "name", "usage")
+            with self._stage("scoring"):
+                for color in rows:
+                    score = self._calculate_relevance(query_lower, color.get("name", ""), color.get("usage", ""))
+                    if score > 0:
+                        results.append(SearchResult(
+                            category="color",
+                            title=f"{color.get('name', '')} ({color.get('value', '')})",
+                            content=f"Usage: {color.get('usage', '')}\nLight: {color.get('light_mode', '')}\nDark: {color.get('dark_mode', '')}",
+                            relevance=score
+                        ))
         
         # Search typography
         if domain in ["all", "style", "typography"]:
-            for typo in self.knowledge["typography"]:
-                score = self._calculate_relevance(query_lower, typo.get("name", ""), typo.get("use_case", ""))
-                if score > 0:
-                    results.append(SearchResult(
-                        category="typography",
-                        title=typo.get("name", ""),
-                        content=f"Font: {typo.get('font_family', '')}, Size: {typo.get('font_size', '')}, Weight: {typo.get('font_weight', '')}\nUse case: {typo.get('use_case', '')}",
-                        relevance=score
-                    ))
+            rows = self._candidates("typography", query_lower, "name", "use_case")
+            with self._stage("scoring"):
+                for typo in rows:
+                    score = self._calculate_relevance(query_lower, typo.get("name", ""), typo.get("use_case", ""))
+                    if score > 0:
+                        results.append(SearchResult(
+                            category="typography",
+                            title=typo.get("name", ""),
+                            content=f"Font: {typo.get('font_family', '')}, Size: {typo.get('font_size', '')}, Weight: {typo.get('font_weight', '')}\nUse case: {typo.get('use_case', '')}",
+                            relevance=score
+                        ))
         
         # Search page templates
         if domain in ["all", "template", "page"]:
-            for template in self.knowledge["page_templates"]:
-                score = self._calculate_relevance(query_lower, template.get("name", ""), template.get("description", ""))
-                if score > 0:
-                    results.append(SearchResult(
-                        category="page_template",
-                        title=template.get("name", ""),
-                        content=f"{template.get('description', '')}\n\nComponents: {template.get('components_used', '')}\n\nStructure:\n{template.get('layout_structure', '')}",
-                        relevance=score
-                    ))
+            rows = self._candidates("page_templates", query_lower, "name", "description")
+            with self._stage("scoring"):
+                for template in rows:
+                    score = self._calculate_relevance(query_lower, template.get("name", ""), template.get("description", ""))
+                    if score > 0:
+                        results.append(SearchResult(
+                            category="page_template",
+                            title=template.get("name", ""),
+                            content=f"{template.get('description', '')}\n\nComponents: {template.get('components_used', '')}\n\nStructure:\n{template.get('layout_structure', '')}",
+                            relevance=score
+                        ))
+        
+        # Search scraped community articles (CSV rows hold a summary only)
+        if domain == "article":
+            rows = self._candidates("scraped_knowledge", query_lower, "title", "content")
+            with self._stage("scoring"):
+                for article in rows:
+                    if article.get("deleted_at"):
+                        continue
+                    score = self._calculate_relevance(query_lower, article.get("title", ""), article.get("content", ""))
+                    if score > 0:
+                        results.append(SearchResult(
+                            category="article",
+                            title=article.get("title", ""),
+                            content=f"{article.get('content', '')}\n\nCode:\n{article.get('code_example', '')}",
+                            relevance=score,
+                            ref=article.get("content_ref", "")
+                        ))
         
         # Sort by relevance
-        results.sort(key=lambda x: x.relevance, reverse=True)
+        with self._stage("sorting"):
+            results.sort(key=lambda x: x.relevance, reverse=True)
         
-        return results[:10]  # Return top 10 results
+        results = results[:10]  # Return top 10 results
+        if any(r.ref for r in results):
+            with self._stage("article bodies"):
+                results = [self._expand_article(r) if r.ref else r for r in results]
+        return results
+    
+    @staticmethod
+    def _expand_article(result: SearchResult) -> SearchResult:
+        """Replace an article's CSV summary with its full body, if stored"""
+        body = load_article_body(result.ref)
+        if body is None:
+            return result
+        content = body.get("content", "")
+        code_blocks = body.get("code_blocks") or []
+        if code_blocks:
+            content += "\n\nCode:\n" + "\n---\n".join(code_blocks)
+        return result._replace(content=content)
+    
+    def related(self, name: str) -> List[SearchResult]:
+        """
+        Find items that go with the named template, pattern, component or snippet
+        
+        Args:
+            name: Item name
+        
+        Returns:
+            The matched item(s) followed by their related bundle
+        """
+        if self._related_index is None:
+            with self._stage("related index"):
+                signature = RelatedIndex.source_signature()
+                index = RelatedIndex.load(RELATED_INDEX_FILE, signature)
+                if index is None:
+                    index = RelatedIndex.build(self.knowledge, signature)
+                    index.save(RELATED_INDEX_FILE)
+                self._related_index = index
+        
+        with self._stage("lookup"):
+            return self._related_index.lookup(name)
     
     def _calculate_relevance(self, query: str, title: str, content: str) -> float:
         """Calculate relevance score"""
@@ -205,6 +859,164 @@ class HarmonyDesignSearch:
             output.append(f"{result.content[:500]}\n")
         
         return "\n".join(output)
+    
+    def generate_resource_files(self) -> Dict[Path, Dict]:
+        """
+        Generate ArkTS resource files from the design tokens
+        
+        The token names come from the knowledge base and do not cover every
+        name the init_harmony_project.py scaffold references (e.g.
+        start_window_background, spacing_lg), so existing files should be
+        updated with merge_resource_file() rather than replaced.
+        
+        Returns:
+            Mapping of relative resource path to JSON data
+        """
+        colors = []
+        dark_colors = []
+        for color in self.knowledge["colors"]:
+            name = color.get("name", "")
+            light = color.get("light_mode") or color.get("value", "")
+            if not name or not light:
+                continue
+            colors.append({"name": name, "value": light})
+            dark = color.get("dark_mode", "")
+            if dark:
+                dark_colors.append({"name": name, "value": dark})
+        
+        floats = []
+        for typo in self.knowledge["typography"]:
+            if typo.get("name") and typo.get("font_size"):
+                floats.append({"name": f"font_size_{typo['name']}", "value": typo["font_size"]})
+        for space in self.knowledge["spacing"]:
+            if space.get("name") and space.get("value"):
+                floats.append({"name": space["name"], "value": space["value"]})
+        
+        return {
+            RESOURCE_COLOR_FILE: {"color": colors},
+            RESOURCE_DARK_COLOR_FILE: {"color": dark_colors},
+            RESOURCE_FLOAT_FILE: {"float": floats},
+        }
+
+
+def merge_resource_file(path: Path, data: Dict) -> Dict:
+    """
+    Merge generated resources into an existing ArkTS resource file
+    
+    Entries whose name already exists are overwritten in place, new names are
+    appended, and names the design tokens do not know about are preserved, so
+    resources referenced elsewhere in the project keep compiling.
+    
+    Args:
+        path: Existing resource file (e.g. base/element/color.json)
+        data: Generated resources, {"color": [{"name", "value"}, ...]}
+    
+    Returns:
+        Merged resource data (the generated data if the file is missing or unreadable)
+    """
+    import json
+    
+    try:
+        existing = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return data
+    if not isinstance(existing, dict):
+        return data
+    
+    merged = dict(existing)
+    for kind, entries in data.items():
+        values = {entry["name"]: entry["value"] for entry in entries}
+        items = []
+        for entry in existing.get(kind) or []:
+            name = entry.get("name") if isinstance(entry, dict) else None
+            if name in values:
+                entry = dict(entry, value=values.pop(name))
+            items.append(entry)
+        items.extend({"name": name, "value": value} for name, value in values.items())
+        merged[kind] = items
+    return merged
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write a file only if its content hash differs from what is on disk
+    
+    Leaving unchanged files untouched keeps their mtime stable, so DevEco's
+    incremental resource compilation is not retriggered on every regeneration.
+    
+    Returns:
+        True if the file was (re)written
+    """
+    import hashlib
+    
+    data = content.encode("utf-8")
+    if path.exists():
+        old_digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if old_digest == hashlib.sha256(data).hexdigest():
+            return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def load_article_body(ref: str) -> Optional[Dict]:
+    """
+    Read a scraped article's full body from the content store
+    
+    Args:
+        ref: content_ref column of the scraped_knowledge row
+    
+    Returns:
+        Dict with title, url, content and code_blocks, or None if not stored
+    """
+    import gzip
+    import json
+    
+    path = ARTICLE_CONTENT_DIR / ref[:2] / f"{ref}.json.gz"
+    try:
+        with gzip.open(path, 'rb') as f:
+            return json.loads(f.read().decode('utf-8'))
+    except (OSError, ValueError, EOFError):
+        return None
+
+
+def format_results(results: List[SearchResult], query: str, fmt: str = "ascii") -> str:
+    """
+    Format search results for output
+    
+    Args:
+        results: Search results
+        query: Original search query
+        fmt: Output format (ascii, markdown, json)
+    
+    Returns:
+        Formatted output
+    """
+    if fmt == "json":
+        import json
+        
+        return json.dumps([{
+            "category": r.category,
+            "title": r.title,
+            "content": r.content,
+            "relevance": r.relevance
+        } for r in results], ensure_ascii=False, indent=2)
+    
+    if not results:
+        return "No results found."
+    
+    lines = []
+    lines.append(f"\n{'='*60}")
+    lines.append(f"Search Results for: {query}")
+    lines.append(f"{'='*60}\n")
+    
+    for i, result in enumerate(results, 1):
+        lines.append(f"[{i}] [{result.category.upper()}] {result.title}")
+        lines.append(f"    Relevance: {'★' * int(result.relevance)}")
+        lines.append(f"    {result.content[:200]}...")
+        lines.append("")
+    
+    return "\n".join(lines)
 
 
 def main():
@@ -212,8 +1024,10 @@ def main():
         description="HarmonyOS NEXT UI/UX Pro Max Skill - Design Intelligence Search"
     )
     parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("--related", metavar="NAME",
+                        help="List items that go with NAME instead of searching")
     parser.add_argument("--domain", "-d", default="all", 
-                        choices=["all", "component", "layout", "style", "color", "typography", "template"],
+                        choices=["all", "component", "layout", "style", "color", "typography", "template", "article"],
                         help="Search domain")
     parser.add_argument("--design-system", action="store_true",
                         help="Generate a complete design system")
@@ -224,54 +1038,66 @@ def main():
                         help="Output format")
     parser.add_argument("--persist", action="store_true",
                         help="Save design system to file")
+    parser.add_argument("--resources-dir", default="design-system/resources",
+                        help="Directory for generated ArkTS resource files (used with --persist)")
+    parser.add_argument("--backend", default="memory", choices=["memory", "sqlite"],
+                        help="Knowledge storage/search backend")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-stage timing/allocation breakdown to stderr")
     
     args = parser.parse_args()
     
-    if not args.query:
+    if args.related is not None and (args.query or args.design_system):
+        parser.error("--related cannot be combined with a search query or --design-system")
+    
+    if not args.query and not args.related:
         parser.print_help()
         return
     
-    searcher = HarmonyDesignSearch()
+    profiler = QueryProfiler() if args.profile else None
+    searcher = HarmonyDesignSearch(profiler=profiler, backend=args.backend)
     
-    if args.design_system:
+    if args.related:
+        # Related-item lookup
+        results = searcher.related(args.related)
+        
+        with searcher._stage("serialisation"):
+            output = format_results(results, args.related, args.format)
+        print(output)
+    elif args.design_system:
         # Generate design system
         result = searcher.generate_design_system(args.query, args.project)
         
         if args.persist:
-            output_dir = Path("design-system")
-            output_dir.mkdir(exist_ok=True)
-            output_file = output_dir / "MASTER.md"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(result)
-            print(f"Design system saved to: {output_file}")
+            output_file = Path("design-system") / "MASTER.md"
+            if write_if_changed(output_file, result):
+                print(f"Design system saved to: {output_file}")
+            else:
+                print(f"Design system unchanged: {output_file}")
+            
+            import json
+            
+            resources_dir = Path(args.resources_dir)
+            for relative_path, data in searcher.generate_resource_files().items():
+                resource_file = resources_dir / relative_path
+                data = merge_resource_file(resource_file, data)
+                content = json.dumps(data, ensure_ascii=False, indent=2)
+                if write_if_changed(resource_file, content):
+                    print(f"Resource file saved to: {resource_file}")
+                else:
+                    print(f"Resource file unchanged: {resource_file}")
         else:
             print(result)
     else:
         # Regular search
         results = searcher.search(args.query, args.domain)
         
-        if args.format == "json":
-            print(json.dumps([{
-                "category": r.category,
-                "title": r.title,
-                "content": r.content,
-                "relevance": r.relevance
-            } for r in results], ensure_ascii=False, indent=2))
-        else:
-            if not results:
-                print("No results found.")
-                return
-            
-            print(f"\n{'='*60}")
-            print(f"Search Results for: {args.query}")
-            print(f"{'='*60}\n")
-            
-            for i, result in enumerate(results, 1):
-                print(f"[{i}] [{result.category.upper()}] {result.title}")
-                print(f"    Relevance: {'★' * int(result.relevance)}")
-                print(f"    {result.content[:200]}...")
-                print()
-
+        with searcher._stage("serialisation"):
+            output = format_results(results, args.query, args.format)
+        print(output)
+    
+    if profiler is not None:
+        print(f"\n{profiler.report()}", file=sys.stderr)
 
 if __name__ == "__main__":
     main()
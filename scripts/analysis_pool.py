@@ -0,0 +1,97 @@
+"""
+HarmonyOS NEXT UI/UX Pro Max Skill - 并行文件分析
+各抓取脚本共用的分析进程池: 文件按批分发到 ProcessPoolExecutor，结果按输入顺序合并
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+# 默认分析进程数
+DEFAULT_JOBS = os.cpu_count() or 1
+# 每批发送给一个进程的文件数 (摊薄进程间通信开销)
+BATCH_SIZE = 64
+
+
+def _run_batch(func: Callable, batch: Sequence) -> List:
+    """在工作进程中依次处理一批输入"""
+    return [func(item) for item in batch]
+
+
+def _noop() -> None:
+    """用于预先启动工作进程的空任务"""
+
+
+class AnalysisPool:
+    """
+    文件分析进程池
+
+    map() 把输入切成 BATCH_SIZE 大小的批次分发到各进程，按输入顺序返回结果，
+    因此与串行执行的输出完全相同。jobs 为 1 或输入不足一批时直接在当前进程执行；
+    进程池在首次需要时创建，可跨多次 map() 复用，也可在多个线程中同时调用 map()。
+    func 须为模块级函数 (或其 functools.partial)，以便传给工作进程。
+    """
+
+    def __init__(self, jobs: Optional[int] = None, batch_size: int = BATCH_SIZE):
+        """
+        Args:
+            jobs: 进程数 (None 表示 CPU 核数)
+            batch_size: 每批文件数
+        """
+        self.jobs = max(1, jobs or DEFAULT_JOBS)
+        self.batch_size = max(1, batch_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """进程池 (首次使用时创建)"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+            return self._executor
+
+    def start(self) -> None:
+        """
+        预先启动工作进程
+
+        在启动下载线程等其他线程之前调用，避免在多线程进程中 fork 工作进程
+        (子进程可能继承其他线程持有的锁)。jobs 为 1 时不创建进程池。
+        """
+        if self.jobs > 1:
+            self._get_executor().submit(_noop).result()
+
+    def map(self, func: Callable, items: Sequence) -> List:
+        """
+        对每个输入调用 func
+
+        Args:
+            func: 分析函数
+            items: 输入 (如文件路径列表)
+
+        Returns:
+            与输入顺序一致的结果列表
+        """
+        items = list(items)
+        if self.jobs == 1 or len(items) <= self.batch_size:
+            return [func(item) for item in items]
+
+        executor = self._get_executor()
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        results = []
+        for batch_results in executor.map(_run_batch, [func] * len(batches), batches):
+            results.extend(batch_results)
+        return results
+
+    def close(self) -> None:
+        """关闭进程池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> "AnalysisPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
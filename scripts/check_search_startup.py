@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+search.py 启动开销回归检查
+
+使用 `python -X importtime` 统计 search.py 在解释器自身启动之外额外引入的
+模块导入耗时，并测量单领域查询的冷启动耗时 (扣除空解释器启动时间)。
+超出预算时以非零状态码退出，可直接接入 CI。
+
+Usage:
+    python check_search_startup.py [options]
+
+Options:
+    --query          查询词 (默认: button)
+    --domain, -d     查询领域 (默认: color)
+    --runs, -n       测量次数，取中位数 (默认: 7)
+    --budget         冷查询耗时预算，毫秒 (默认: 50)
+    --import-budget  额外导入耗时预算，毫秒 (默认: 25)
+    --max-modules    额外导入模块数上限 (默认: 60)
+
+Example:
+    python check_search_startup.py
+    python check_search_startup.py --domain component --budget 60
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+SEARCH_SCRIPT = Path(__file__).parent.parent / ".shared" / "harmony-ui-ux-pro-max" / "scripts" / "search.py"
+
+
+def parse_importtime(stderr: str) -> Tuple[Dict[str, int], Set[str]]:
+    """
+    解析 -X importtime 输出
+
+    Args:
+        stderr: 子进程的 stderr 输出
+
+    Returns:
+        (顶层模块名 -> 累计导入耗时 (微秒), 全部导入的模块名)
+    """
+    top_level = {}
+    all_modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        all_modules.add(name.strip())
+        # 只统计顶层导入的耗时 (嵌套导入已计入其父模块的累计耗时)
+        if not name.startswith("  "):
+            top_level[name.strip()] = int(parts[1])
+    return top_level, all_modules
+
+
+def run_importtime(args: List[str], runs: int) -> Tuple[Dict[str, int], Set[str]]:
+    """在 -X importtime 下多次运行 Python，返回各顶层模块导入耗时的中位数及模块集合"""
+    samples: Dict[str, List[int]] = {}
+    all_modules = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime"] + args,
+            capture_output=True, text=True, encoding="utf-8"
+        )
+        top_level, modules = parse_importtime(result.stderr)
+        all_modules |= modules
+        for name, us in top_level.items():
+            samples.setdefault(name, []).append(us)
+    return {name: int(statistics.median(values)) for name, values in samples.items()}, all_modules
+
+
+def measure_wall_time(args: List[str], runs: int) -> float:
+    """测量多次运行的中位耗时 (毫秒)"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, stdout=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check search.py cold-start cost against a budget."
+    )
+    parser.add_argument("--query", default="button", help="查询词 (默认: button)")
+    parser.add_argument("--domain", "-d", default="color", help="查询领域 (默认: color)")
+    parser.add_argument("--runs", "-n", type=int, default=7, help="测量次数 (默认: 7)")
+    parser.add_argument("--budget", type=float, default=50.0,
+                        help="冷查询耗时预算，毫秒 (默认: 50)")
+    parser.add_argument("--import-budget", type=float, default=25.0,
+                        help="额外导入耗时预算，毫秒 (默认: 25)")
+    parser.add_argument("--max-modules", type=int, default=60,
+                        help="额外导入模块数上限 (默认: 60)")
+
+    args = parser.parse_args()
+
+    query_args = [str(SEARCH_SCRIPT), args.query, "--domain", args.domain]
+
+    # 导入耗时: 扣除空解释器本身就会导入的模块
+    # 模块数不受机器负载影响，是比耗时更稳定的回归信号
+    _, baseline_modules = run_importtime(["-c", "pass"], 1)
+    search_times, search_modules = run_importtime(query_args, args.runs)
+    extra_modules = {
+        name: us for name, us in search_times.items() if name not in baseline_modules
+    }
+    import_ms = sum(extra_modules.values()) / 1000
+    module_count = len(search_modules - baseline_modules)
+
+    # 冷查询耗时: 扣除空解释器启动时间
+    interpreter_ms = measure_wall_time(["-c", "pass"], args.runs)
+    query_ms = measure_wall_time(query_args, args.runs) - interpreter_ms
+
+    print(f"\n{'='*60}")
+    print(f"  search.py startup check ({args.query!r}, --domain {args.domain})")
+    print(f"{'='*60}")
+    for name, us in sorted(extra_modules.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {name:<30} {us / 1000:>8.2f} ms")
+    print(f"{'-'*60}")
+    print(f"  Modules:     {module_count:>8} (max {args.max_modules})")
+    print(f"  Imports:     {import_ms:>8.2f} ms (budget {args.import_budget:.0f} ms)")
+    print(f"  Interpreter: {interpreter_ms:>8.2f} ms")
+    print(f"  Query:       {query_ms:>8.2f} ms (budget {args.budget:.0f} ms)")
+    print(f"{'='*60}\n")
+
+    failed = False
+    if module_count > args.max_modules:
+        print(f"Error: 额外导入模块数超出上限 ({module_count} > {args.max_modules})")
+        failed = True
+    if import_ms > args.import_budget:
+        print(f"Error: 导入耗时超出预算 ({import_ms:.2f} > {args.import_budget:.0f} ms)")
+        failed = True
+    if query_ms > args.budget:
+        print(f"Error: 冷查询耗时超出预算 ({query_ms:.2f} > {args.budget:.0f} ms)")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
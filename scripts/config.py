@@ -17,6 +17,32 @@ GITHUB_OUTPUT_DIR = OUTPUT_DIR / "github"
 COMPONENTS_OUTPUT_DIR = OUTPUT_DIR / "components"
 DOCS_OUTPUT_DIR = OUTPUT_DIR / "docs"
 
+# HTTP 响应缓存目录 (ETag/Last-Modified 重新验证)
+HTTP_CACHE_DIR = PROJECT_ROOT / ".cache" / "http"
+
+# 未完成下载的分段文件 (断点续传，下载完成并校验后删除)
+DOWNLOAD_PARTS_DIR = PROJECT_ROOT / ".cache" / "downloads"
+
+# 文档爬虫的可恢复抓取状态 (队列 + 知识检查点)
+CRAWL_STATE_PATH = PROJECT_ROOT / ".cache" / "crawl_state.sqlite3"
+
+# 已导出文章的 SimHash 指纹 (跨运行的近似重复检测)
+SIMHASH_INDEX_PATH = PROJECT_ROOT / ".cache" / "simhash_index.json"
+
+# 文章完整正文与代码块的压缩存储 (CSV 中的 content_ref 指向此处)
+CONTENT_STORE_DIR = PROJECT_ROOT / "knowledge_base" / "content"
+
+# 已收录的 GitHub 仓库 (按 id 记录 pushed_at，未更新的仓库不再重新抓取)
+GITHUB_REPO_INDEX_PATH = PROJECT_ROOT / ".cache" / "github_repos.json"
+
+# 组件索引的文件级缓存 (与 component_index.json 同目录；内容哈希未变的文件不再重新分析)
+COMPONENT_CACHE_PATH = GITHUB_OUTPUT_DIR / "component_cache.json"
+
+# 抓取指标运行报告目录 (<脚本名>.json)
+METRICS_DIR = PROJECT_ROOT / ".cache" / "metrics"
+# 同时输出 Prometheus 文本格式 (<脚本名>.prom，可供 node_exporter textfile collector 读取)
+METRICS_PROMETHEUS = os.getenv("METRICS_PROMETHEUS", "").lower() in ("1", "true", "yes")
+
 # ============== Figma 配置 ==============
 # Figma API Token (从环境变量读取)
 FIGMA_TOKEN = os.getenv("FIGMA_TOKEN", "")
@@ -31,6 +57,9 @@ FIGMA_RESOURCES = {
 }
 
 # ============== GitHub/Gitee 配置 ==============
+# GitHub API Token (可选，从环境变量读取；提高 API 配额)
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+
 # 需要抓取的仓库列表
 GITHUB_REPOS = [
     {
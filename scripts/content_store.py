@@ -0,0 +1,97 @@
+"""
+HarmonyOS NEXT UI/UX Pro Max Skill - 文章正文存储
+完整正文与全部代码块按 URL 哈希压缩存放，CSV 只保留摘要与指向此处的 content_ref
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+# content_ref 长度 (URL 的 SHA-256 前缀，十六进制)
+REF_LENGTH = 24
+# 压缩级别 (正文按需解压，偏向压缩率)
+COMPRESS_LEVEL = 9
+
+
+def content_ref(url: str) -> str:
+    """URL 对应的存储键"""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:REF_LENGTH]
+
+
+class ContentStore:
+    """
+    按 URL 哈希寻址的压缩正文存储
+
+    每篇文章一个文件 <目录>/<前两位>/<content_ref>.json.gz，内容为
+    {"url", "title", "content", "code_blocks"}。gzip 头不含时间戳，
+    相同内容总是得到相同的文件，内容未变时不重写。
+    """
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: 存储目录
+        """
+        self.root = root
+
+    def path(self, ref: str) -> Path:
+        """存储键对应的文件路径"""
+        return self.root / ref[:2] / f"{ref}.json.gz"
+
+    def put(self, url: str, body: Dict) -> str:
+        """
+        保存文章正文
+
+        Args:
+            url: 文章 URL
+            body: 正文字典 (title、content、code_blocks 等)
+
+        Returns:
+            content_ref
+        """
+        ref = content_ref(url)
+        data = json.dumps(dict(body, url=url), ensure_ascii=False, sort_keys=True).encode('utf-8')
+        compressed = gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+
+        path = self.path(ref)
+        try:
+            if path.read_bytes() == compressed:
+                return ref
+        except OSError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        return ref
+
+    def get(self, ref: str) -> Optional[Dict]:
+        """
+        读取文章正文
+
+        Returns:
+            正文字典，不存在或损坏时为 None
+        """
+        try:
+            with gzip.open(self.path(ref), 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def remove(self, ref: str) -> None:
+        """删除文章正文 (不存在时忽略)"""
+        try:
+            self.path(ref).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,290 @@
+"""
+HarmonyOS NEXT UI/UX Pro Max Skill - 抓取指标
+按主机统计请求数、状态码、延迟分位数、下载字节数、缓存命中与重试次数，
+以及各阶段耗时；输出 JSON 运行报告，可选输出 Prometheus 文本格式
+"""
+
+import os
+import json
+import math
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+# 报告中的延迟分位数
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Prometheus 指标名前缀
+METRIC_PREFIX = "harmony_crawl"
+
+
+@dataclass
+class HostStats:
+    """单个主机的请求统计"""
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    cached_bytes: int = 0
+    cache_hits: int = 0
+    retries: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    latencies: List[float] = field(default_factory=list)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """最近秩法分位数 (输入须已排序)"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class CrawlMetrics:
+    """
+    一次抓取运行的指标
+
+    通过 instrument() 包装会话后，会话发出的每个请求 (含缓存重新验证) 都会被记录；
+    各记录方法线程安全，可在抓取线程池中调用。
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 运行名称 (脚本名)，作为报告与 Prometheus job 标签
+        """
+        self.name = name
+        self.started_at = time.time()
+        self.hosts: Dict[str, HostStats] = {}
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> HostStats:
+        host = urlparse(url).netloc or "unknown"
+        if host not in self.hosts:
+            self.hosts[host] = HostStats()
+        return self.hosts[host]
+
+    def record_request(self, url: str, status: Optional[int], elapsed: float,
+                       size: int = 0, from_cache: bool = False) -> None:
+        """
+        记录一次请求
+
+        Args:
+            url: 请求 URL
+            status: 状态码 (None 表示连接错误等无响应的失败)
+            elapsed: 耗时 (秒)
+            size: 响应体字节数 (来自缓存时计入 cached_bytes 而非 bytes)
+            from_cache: 响应体是否来自本地缓存 (304 重新验证)
+        """
+        with self._lock:
+            stats = self._host(url)
+            stats.requests += 1
+            stats.statuses[str(status) if status is not None else "error"] += 1
+            if status is None or status >= 400:
+                stats.errors += 1
+            stats.latencies.append(elapsed)
+            if from_cache:
+                stats.cache_hits += 1
+                stats.cached_bytes += size
+            else:
+                stats.bytes += size
+
+    def record_retry(self, url: str, count: int = 1) -> None:
+        """记录重试次数"""
+        if count > 0:
+            with self._lock:
+                self._host(url).retries += count
+
+    def record_stage(self, name: str, elapsed: float) -> None:
+        """累计一个阶段的耗时 (同名阶段可多次记录，如每个页面的解析)"""
+        with self._lock:
+            stage = self.stages.setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+            stage["count"] += 1
+            stage["seconds"] += elapsed
+            stage["max_seconds"] = max(stage["max_seconds"], elapsed)
+
+    @contextmanager
+    def stage(self, name: str):
+        """计时上下文: with metrics.stage("export"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+
+    def instrument(self, session: requests.Session) -> None:
+        """
+        包装会话，记录其发出的每个请求
+
+        流式请求在返回时尚未读取响应体，字节数取自 Content-Length。
+
+        Args:
+            session: 会话
+        """
+        send_request = session.request
+
+        def request(method, url, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                response = send_request(method, url, *args, **kwargs)
+            except requests.exceptions.RequestException:
+                self.record_request(url, None, time.perf_counter() - start)
+                raise
+            if kwargs.get("stream"):
+                size = int(response.headers.get("Content-Length") or 0)
+            else:
+                size = len(response.content)
+            self.record_request(
+                url, response.status_code, time.perf_counter() - start,
+                size=size, from_cache=getattr(response, "from_cache", False)
+            )
+            return response
+
+        session.request = request
+
+    def report(self) -> Dict:
+        """
+        生成运行报告
+
+        Returns:
+            可序列化为 JSON 的字典
+        """
+        with self._lock:
+            hosts = {}
+            for host, stats in sorted(self.hosts.items()):
+                latencies = sorted(stats.latencies)
+                hosts[host] = {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "statuses": dict(sorted(stats.statuses.items())),
+                    "bytes": stats.bytes,
+                    "cached_bytes": stats.cached_bytes,
+                    "cache_hits": stats.cache_hits,
+                    "cache_hit_ratio": round(stats.cache_hits / stats.requests, 4) if stats.requests else 0.0,
+                    "retries": stats.retries,
+                    "latency_seconds": {
+                        **{f"p{int(q * 100)}": round(percentile(latencies, q), 4) for q in QUANTILES},
+                        "max": round(latencies[-1], 4) if latencies else 0.0,
+                        "mean": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+                        "sum": round(sum(latencies), 4),
+                    },
+                }
+            stages = {
+                name: {key: round(value, 4) for key, value in stage.items()}
+                for name, stage in self.stages.items()
+            }
+
+        total_requests = sum(h["requests"] for h in hosts.values())
+        total_hits = sum(h["cache_hits"] for h in hosts.values())
+        finished_at = time.time()
+        return {
+            "name": self.name,
+            "started_at": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started_at)),
+            "finished_at": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(finished_at)),
+            "duration_seconds": round(finished_at - self.started_at, 3),
+            "totals": {
+                "requests": total_requests,
+                "errors": sum(h["errors"] for h in hosts.values()),
+                "bytes": sum(h["bytes"] for h in hosts.values()),
+                "cached_bytes": sum(h["cached_bytes"] for h in hosts.values()),
+                "cache_hits": total_hits,
+                "cache_hit_ratio": round(total_hits / total_requests, 4) if total_requests else 0.0,
+                "retries": sum(h["retries"] for h in hosts.values()),
+            },
+            "hosts": hosts,
+            "stages": stages,
+        }
+
+    def to_prometheus(self, report: Optional[Dict] = None) -> str:
+        """
+        以 Prometheus 文本格式导出 (可供 node_exporter textfile collector 读取)
+
+        Args:
+            report: 已生成的报告 (默认重新生成)
+
+        Returns:
+            指标文本
+        """
+        report = report or self.report()
+        job = _escape_label(self.name)
+        lines = []
+
+        def sample(name: str, labels, value):
+            label_text = ",".join([f'job="{job}"'] + [f'{k}="{_escape_label(str(v))}"' for k, v in labels])
+            lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}")
+
+        def metric(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                sample(name, labels, value)
+
+        hosts = report["hosts"]
+        metric("requests_total", "counter", "HTTP requests by host and status.", [
+            ((("host", host), ("status", status)), count)
+            for host, h in hosts.items() for status, count in h["statuses"].items()
+        ])
+        metric("bytes_total", "counter", "Response bytes downloaded by host (excluding cache hits).", [
+            ((("host", host),), h["bytes"]) for host, h in hosts.items()
+        ])
+        metric("cached_bytes_total", "counter", "Response bytes served from the local HTTP cache by host.", [
+            ((("host", host),), h["cached_bytes"]) for host, h in hosts.items()
+        ])
+        metric("cache_hits_total", "counter", "Responses served from the local HTTP cache by host.", [
+            ((("host", host),), h["cache_hits"]) for host, h in hosts.items()
+        ])
+        metric("retries_total", "counter", "Request retries by host.", [
+            ((("host", host),), h["retries"]) for host, h in hosts.items()
+        ])
+        # 延迟分位数按 summary 导出: 各分位数 (max 即 quantile="1") 加 _sum / _count
+        metric("request_latency_seconds", "summary", "Request latency by host.", [
+            ((("host", host), ("quantile", int(key[1:]) / 100 if key.startswith("p") else 1)), value)
+            for host, h in hosts.items() for key, value in h["latency_seconds"].items()
+            if key.startswith("p") or key == "max"
+        ])
+        for host, h in hosts.items():
+            sample("request_latency_seconds_sum", (("host", host),), h["latency_seconds"]["sum"])
+            sample("request_latency_seconds_count", (("host", host),), h["requests"])
+        metric("stage_seconds_total", "counter", "Time spent per pipeline stage.", [
+            ((("stage", name),), stage["seconds"]) for name, stage in report["stages"].items()
+        ])
+        metric("run_duration_seconds", "gauge", "Wall-clock duration of the run.", [
+            ((), report["duration_seconds"])
+        ])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path, prometheus: bool = False) -> Dict:
+        """
+        写入 JSON 运行报告 (及同名 .prom 文件)
+
+        Args:
+            path: JSON 报告路径
+            prometheus: 是否同时写入 Prometheus 文本格式
+
+        Returns:
+            运行报告
+        """
+        report = self.report()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, json.dumps(report, ensure_ascii=False, indent=2))
+        if prometheus:
+            _write_atomic(path.with_suffix(".prom"), self.to_prometheus(report))
+        return report
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
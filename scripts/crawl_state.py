@@ -0,0 +1,151 @@
+"""
+HarmonyOS NEXT UI/UX Pro Max Skill - 爬取状态持久化
+可恢复的抓取队列 (frontier/visited) 与已提取知识的检查点
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 每提取多少条知识提交一次检查点
+CHECKPOINT_INTERVAL = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    url TEXT PRIMARY KEY,
+    source TEXT,
+    title TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_frontier_status ON frontier (status);
+CREATE TABLE IF NOT EXISTS knowledge (
+    url TEXT PRIMARY KEY,
+    position INTEGER,
+    data TEXT NOT NULL
+);
+"""
+
+
+class CrawlState:
+    """
+    SQLite 持久化的爬取状态
+
+    - frontier: 每个文章 URL 的状态 (pending / done / failed) 与尝试次数
+    - knowledge: 已提取的知识，与对应 URL 的 done 标记在同一事务中提交，
+      因此中途崩溃后不会出现 "已完成但知识丢失" 的 URL
+
+    一次完整的运行结束时调用 finish()，下次启动即开始新一轮抓取；
+    未调用 finish() 的运行 (崩溃或中断) 会在下次启动时被恢复。
+    """
+
+    def __init__(self, path: Path, checkpoint_interval: int = CHECKPOINT_INTERVAL):
+        """
+        Args:
+            path: 状态数据库路径
+            checkpoint_interval: 每提取多少条知识提交一次
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self._uncommitted = 0
+
+        status = self._get_meta("run_status")
+        self.resumed = status == "running"
+        if not self.resumed:
+            self.reset()
+        self._set_meta("run_status", "running")
+        self.conn.commit()
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def reset(self) -> None:
+        """清空上一轮的状态，开始新一轮抓取"""
+        self.conn.execute("DELETE FROM frontier")
+        self.conn.execute("DELETE FROM knowledge")
+        self._set_meta("started_at", time.strftime('%Y-%m-%d %H:%M:%S'))
+        self.conn.commit()
+
+    def add(self, url: str, source: str, title: str = "") -> None:
+        """将 URL 加入队列 (已存在则忽略)"""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO frontier (url, source, title, updated_at) VALUES (?, ?, ?, ?)",
+            (url, source, title, time.strftime('%Y-%m-%d %H:%M:%S'))
+        )
+
+    def is_done(self, url: str) -> bool:
+        """URL 是否已在本轮中完成"""
+        row = self.conn.execute("SELECT status FROM frontier WHERE url = ?", (url,)).fetchone()
+        return bool(row) and row[0] == "done"
+
+    def mark_done(self, url: str) -> None:
+        """标记 URL 完成 (随下一个检查点提交)"""
+        self.conn.execute(
+            "UPDATE frontier SET status = 'done', attempts = attempts + 1, updated_at = ? WHERE url = ?",
+            (time.strftime('%Y-%m-%d %H:%M:%S'), url)
+        )
+        self._tick()
+
+    def mark_failed(self, url: str) -> None:
+        """标记 URL 失败 (下次运行会重试)"""
+        self.conn.execute(
+            "UPDATE frontier SET status = 'failed', attempts = attempts + 1, updated_at = ? WHERE url = ?",
+            (time.strftime('%Y-%m-%d %H:%M:%S'), url)
+        )
+        self._tick()
+
+    def save_knowledge(self, url: str, data: str) -> None:
+        """
+        保存一条已提取的知识 (随下一个检查点提交)
+
+        Args:
+            url: 知识来源 URL
+            data: 序列化后的知识 (JSON)
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO knowledge (url, position, data) "
+            "VALUES (?, COALESCE((SELECT position FROM knowledge WHERE url = ?), "
+            "(SELECT COUNT(*) FROM knowledge)), ?)",
+            (url, url, data)
+        )
+
+    def load_knowledge(self) -> List[str]:
+        """按提取顺序返回已检查点的知识 (JSON)"""
+        return [row[0] for row in self.conn.execute("SELECT data FROM knowledge ORDER BY position")]
+
+    def stats(self) -> Dict[str, int]:
+        """各状态的 URL 数量"""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM frontier GROUP BY status"))
+
+    def _tick(self) -> None:
+        self._uncommitted += 1
+        if self._uncommitted >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """提交当前进度"""
+        self.conn.commit()
+        self._uncommitted = 0
+
+    def finish(self) -> None:
+        """标记本轮抓取完整结束"""
+        self._set_meta("run_status", "complete")
+        self._set_meta("finished_at", time.strftime('%Y-%m-%d %H:%M:%S'))
+        self.checkpoint()
+
+    def close(self) -> None:
+        self.checkpoint()
+        self.conn.close()
@@ -0,0 +1,325 @@
+"""
+HarmonyOS NEXT UI/UX Pro Max Skill - 异步抓取引擎
+基于 asyncio 的有界并发抓取核心，按主机令牌桶限速
+"""
+
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+# 配额重置后额外等待的秒数 (容忍客户端与服务器的时钟误差)
+RATE_LIMIT_RESET_MARGIN = 1.0
+# X-RateLimit-Remaining 降到这个数时即暂停到重置时刻，给仍在途的请求留出余量
+RATE_LIMIT_RESERVE = 2
+# 单个请求因配额耗尽等待重置的次数上限 (这些等待不计入重试次数)
+MAX_RATE_LIMIT_WAITS = 5
+
+
+@dataclass
+class FetchRequest:
+    """待抓取的请求"""
+    url: str
+    method: str = "GET"
+    params: Optional[Dict] = None
+    json: Optional[Dict] = None
+    headers: Optional[Dict] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FetchResult:
+    """抓取结果"""
+    request: FetchRequest
+    response: Optional[requests.Response] = None
+    error: Optional[Exception] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None and self.error is None
+
+    @property
+    def text(self) -> Optional[str]:
+        """
+        响应文本
+
+        Content-Type 未声明 charset 时按 UTF-8 解码 (requests 对 text/* 默认的
+        ISO-8859-1 会把中文页面解成乱码)。
+
+        >>> response = requests.Response()
+        >>> response.headers['Content-Type'] = 'text/html'
+        >>> response._content = '<title>标题</title>'.encode('utf-8')
+        >>> response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        >>> FetchResult(FetchRequest('https://example.com/'), response).text
+        '<title>标题</title>'
+        >>> response.headers['Content-Type'] = 'text/html; charset=gbk'
+        >>> response._content = '<title>标题</title>'.encode('gbk')
+        >>> response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        >>> FetchResult(FetchRequest('https://example.com/'), response).text
+        '<title>标题</title>'
+        """
+        if not self.ok:
+            return None
+        if 'charset' not in self.response.headers.get('Content-Type', '').lower():
+            self.response.encoding = 'utf-8'
+        else:
+            self.response.encoding = self.response.encoding or 'utf-8'
+        return self.response.text
+
+
+class TokenBucket:
+    """
+    令牌桶限速器
+
+    令牌以 rate 个/秒的速度补充，最多积累 capacity 个。取令牌时若不足则预占
+    (令牌数可为负) 并等待到该令牌补齐，因此无需锁，且按调用顺序放行。
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量 (允许的突发请求数)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        预占一个令牌
+
+        Returns:
+            需要等待的秒数 (0 表示可立即执行)
+        """
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    async def acquire(self) -> None:
+        """等待直到获得一个令牌"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostRateLimiter:
+    """
+    按主机划分的令牌桶集合，不同主机的请求互不阻塞
+
+    overrides 的键可以是主机名，也可以是 "主机/路径前缀" (如 "api.github.com/search")，
+    用于同一主机上配额独立的接口；URL 按最长匹配的前缀归入限速范围，配额状态也按范围记录。
+    另外读取响应中的 X-RateLimit-Remaining / X-RateLimit-Reset (GitHub 等) 与
+    Retry-After 头: 剩余配额降到 RATE_LIMIT_RESERVE 时该范围的后续请求等待到重置时刻，
+    而非等到出错后固定退避。
+    """
+
+    def __init__(self, default_rate: float, default_burst: float = 1.0,
+                 overrides: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Args:
+            default_rate: 默认每主机每秒请求数
+            default_burst: 默认每主机突发请求数
+            overrides: 主机名或 "主机/路径前缀" -> (每秒请求数, 突发请求数)
+        """
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.overrides = overrides or {}
+        # 带路径的范围，长前缀优先匹配
+        self.path_scopes = sorted((key for key in self.overrides if '/' in key), key=len, reverse=True)
+        self.buckets: Dict[str, TokenBucket] = {}
+        # 范围 -> 配额重置的时间戳 (time.time())
+        self.blocked_until: Dict[str, float] = {}
+
+    def scope(self, url: str) -> str:
+        """URL 所属的限速范围 (匹配的 "主机/路径前缀"，否则为主机名)"""
+        parsed = urlparse(url)
+        location = parsed.netloc + parsed.path
+        for scope in self.path_scopes:
+            if location.startswith(scope):
+                return scope
+        return parsed.netloc
+
+    def bucket(self, scope: str) -> TokenBucket:
+        """获取 (或创建) 范围对应的令牌桶"""
+        if scope not in self.buckets:
+            rate, burst = self.overrides.get(scope, (self.default_rate, self.default_burst))
+            self.buckets[scope] = TokenBucket(rate, burst)
+        return self.buckets[scope]
+
+    def observe(self, url: str, response: requests.Response) -> None:
+        """
+        根据响应头记录主机的配额状态
+
+        Args:
+            url: 请求 URL
+            response: 响应 (包括错误响应)
+        """
+        headers = response.headers
+        until = None
+        retry_after = headers.get("Retry-After", "")
+        remaining = headers.get("X-RateLimit-Remaining", "")
+        reset = headers.get("X-RateLimit-Reset", "")
+        if retry_after.isdigit():
+            until = time.time() + int(retry_after)
+        elif remaining.isdigit() and int(remaining) <= RATE_LIMIT_RESERVE and reset.isdigit():
+            until = float(reset)
+        if until:
+            scope = self.scope(url)
+            self.blocked_until[scope] = max(self.blocked_until.get(scope, 0.0), until)
+
+    def is_blocked(self, url: str) -> bool:
+        """URL 所属范围的配额是否已耗尽或即将耗尽 (尚未到重置时刻)"""
+        return self.blocked_until.get(self.scope(url), 0.0) > time.time()
+
+    async def acquire(self, url: str) -> None:
+        """等待 URL 所属范围的配额重置 (如已耗尽) 与令牌"""
+        scope = self.scope(url)
+        wait = self.blocked_until.get(scope, 0.0) - time.time()
+        if wait > 0:
+            await asyncio.sleep(wait + RATE_LIMIT_RESET_MARGIN)
+        await self.bucket(scope).acquire()
+
+
+class AsyncFetcher:
+    """
+    有界并发抓取器
+
+    asyncio 负责调度，阻塞的 requests 调用在固定大小的线程池中执行；
+    同时在途的请求数不超过 max_workers，每个主机的请求频率由 HostRateLimiter 控制。
+    """
+
+    def __init__(self, session: requests.Session, rate_limiter: HostRateLimiter,
+                 max_workers: int = 8, timeout: float = 30, max_retries: int = 2,
+                 metrics=None):
+        """
+        Args:
+            session: 用于发送请求的会话
+            rate_limiter: 按主机限速器
+            max_workers: 最大并发请求数
+            timeout: 单个请求超时 (秒)
+            max_retries: 失败后的最大重试次数
+            metrics: 记录重试次数的 CrawlMetrics (可选)
+        """
+        self.session = session
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+    def _send(self, request: FetchRequest) -> requests.Response:
+        """在工作线程中发送请求"""
+        response = self.session.request(
+            request.method, request.url,
+            params=request.params, json=request.json,
+            headers=request.headers, timeout=self.timeout
+        )
+        self.rate_limiter.observe(request.url, response)
+        response.raise_for_status()
+        return response
+
+    async def fetch(self, request: FetchRequest) -> FetchResult:
+        """
+        抓取单个请求 (含限速与重试)
+
+        Args:
+            request: 请求
+
+        Returns:
+            抓取结果 (失败时 error 非空)
+        """
+        loop = asyncio.get_running_loop()
+        result = FetchResult(request=request)
+        start = time.monotonic()
+
+        # 失败次数 (不含因配额耗尽而等待重置的请求) 与配额等待次数
+        failures = rate_limit_waits = 0
+        while failures <= self.max_retries:
+            await self.rate_limiter.acquire(request.url)
+            result.attempts += 1
+            try:
+                result.response = await loop.run_in_executor(self._executor, partial(self._send, request))
+                result.error = None
+                break
+            except requests.exceptions.HTTPError as e:
+                result.response = None
+                result.error = e
+                status = e.response.status_code if e.response is not None else 0
+                # 429 及配额耗尽的 403: 下一次 acquire() 等待到重置时刻，不占用重试次数
+                if (status in (403, 429) and self.rate_limiter.is_blocked(request.url)
+                        and rate_limit_waits < MAX_RATE_LIMIT_WAITS):
+                    rate_limit_waits += 1
+                    continue
+                # 其他 4xx 重试无意义 (没有配额头的 429 按普通失败重试)
+                if 400 <= status < 500 and status != 429:
+                    break
+                failures += 1
+            except requests.exceptions.RequestException as e:
+                result.response = None
+                result.error = e
+                failures += 1
+
+        result.elapsed = time.monotonic() - start
+        if self.metrics is not None:
+            self.metrics.record_retry(request.url, result.attempts - 1)
+        return result
+
+    async def fetch_all(self, requests_: Iterable[FetchRequest],
+                        on_result: Optional[Callable[[FetchResult], Awaitable[None]]] = None,
+                        concurrency: Optional[int] = None) -> List[FetchResult]:
+        """
+        并发抓取一批请求
+
+        Args:
+            requests_: 请求列表
+            on_result: 每个请求完成时调用的协程 (如放入有界队列)；
+                       其阻塞时对应的抓取工作协程暂停，形成背压
+            concurrency: 本批请求的并发上限 (默认 max_workers；线程池仍为全局共享)
+
+        Returns:
+            与输入顺序一致的抓取结果
+        """
+        requests_ = list(requests_)
+        results: List[Optional[FetchResult]] = [None] * len(requests_)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(requests_):
+            queue.put_nowait(item)
+
+        async def worker():
+            while True:
+                try:
+                    index, request = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results[index] = await self.fetch(request)
+                if on_result is not None:
+                    await on_result(results[index])
+
+        limit = min(concurrency or self.max_workers, self.max_workers)
+        workers = [asyncio.create_task(worker()) for _ in range(min(limit, len(requests_)))]
+        await asyncio.gather(*workers)
+        return results
+
+    def run(self, requests_: Iterable[FetchRequest]) -> List[FetchResult]:
+        """同步入口: 并发抓取一批请求并等待全部完成"""
+        return asyncio.run(self.fetch_all(requests_))
+
+    def close(self) -> None:
+        """关闭线程池"""
+        self._executor.shutdown(wait=True)
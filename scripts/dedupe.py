@@ -0,0 +1,158 @@
+"""
+HarmonyOS NEXT UI/UX Pro Max Skill - 近似重复检测
+基于 SimHash 的文章指纹与分段 (LSH) 索引，用于识别各社区间转载的同一篇文章
+"""
+
+import os
+import re
+import json
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+# 指纹位数
+SIMHASH_BITS = 64
+# 汉明距离不超过该值视为近似重复
+MAX_DISTANCE = 3
+# 分段数: 距离 <= MAX_DISTANCE 的两个指纹至少有一段完全相同 (鸽巢原理)
+BANDS = MAX_DISTANCE + 1
+# 字符 n-gram 长度 (中文无空格分词，按字符切片)
+SHINGLE_SIZE = 3
+# 短于该长度的文本不做指纹 (信息量不足，容易误判)
+MIN_TEXT_LENGTH = 100
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def simhash(text: str) -> int:
+    """
+    计算文本的 64 位 SimHash
+
+    Args:
+        text: 文本 (空白会被规整，英文转小写)
+
+    Returns:
+        指纹整数
+    """
+    text = _WHITESPACE_RE.sub(' ', text).strip().lower()
+    shingles = Counter(text[i:i + SHINGLE_SIZE] for i in range(max(1, len(text) - SHINGLE_SIZE + 1)))
+
+    weights = [0] * SIMHASH_BITS
+    for shingle, count in shingles.items():
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """两个指纹的汉明距离"""
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """
+    SimHash 近似重复索引
+
+    指纹切分为 BANDS 段，每段作为倒排桶的键；查询只需比较与其至少一段相同的
+    候选，而非全部历史指纹。指纹按 URL 持久化到 JSON 文件，后续运行直接加载
+    历史指纹去重，无需重新计算旧文章。
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_distance: int = MAX_DISTANCE):
+        """
+        Args:
+            path: 指纹持久化文件 (None 表示仅在内存中)
+            max_distance: 近似重复的最大汉明距离 (不超过 BANDS - 1)
+        """
+        self.path = path
+        self.max_distance = min(max_distance, BANDS - 1)
+        self.band_bits = SIMHASH_BITS // BANDS
+        self.signatures: Dict[str, int] = {}
+        self.buckets: Dict[Tuple[int, int], Set[str]] = {}
+
+        if path and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for url, sig in json.load(f).items():
+                        self.add(url, int(sig, 16))
+            except (OSError, ValueError):
+                self.signatures.clear()
+                self.buckets.clear()
+
+    def _bands(self, sig: int):
+        mask = (1 << self.band_bits) - 1
+        for band in range(BANDS):
+            yield band, sig >> (band * self.band_bits) & mask
+
+    def find(self, sig: int, exclude_url: str = "") -> Optional[str]:
+        """
+        查找近似重复
+
+        Args:
+            sig: 待查指纹
+            exclude_url: 忽略的 URL (同一 URL 重新抓取不算重复)
+
+        Returns:
+            最相近的已有 URL，没有则为 None
+        """
+        best, best_distance = None, self.max_distance + 1
+        candidates = set()
+        for key in self._bands(sig):
+            candidates |= self.buckets.get(key, set())
+        candidates.discard(exclude_url)
+        for url in sorted(candidates):
+            distance = hamming_distance(sig, self.signatures[url])
+            if distance < best_distance:
+                best, best_distance = url, distance
+        return best
+
+    def add(self, url: str, sig: int) -> None:
+        """加入 (或替换) URL 的指纹"""
+        self.remove(url)
+        self.signatures[url] = sig
+        for key in self._bands(sig):
+            self.buckets.setdefault(key, set()).add(url)
+
+    def remove(self, url: str) -> None:
+        """移除 URL 的指纹"""
+        sig = self.signatures.pop(url, None)
+        if sig is None:
+            return
+        for key in self._bands(sig):
+            bucket = self.buckets.get(key)
+            if bucket:
+                bucket.discard(url)
+                if not bucket:
+                    del self.buckets[key]
+
+    def check(self, url: str, text: str) -> Optional[str]:
+        """
+        检查文本是否与已有文章近似重复；不重复时将其指纹加入索引
+
+        Args:
+            url: 文章 URL
+            text: 用于指纹的文本
+
+        Returns:
+            重复时返回已有文章的 URL，否则为 None
+        """
+        if len(text.strip()) < MIN_TEXT_LENGTH:
+            return None
+        sig = simhash(text)
+        duplicate_of = self.find(sig, exclude_url=url)
+        if duplicate_of is None:
+            self.add(url, sig)
+        return duplicate_of
+
+    def save(self) -> None:
+        """原子写入指纹文件"""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({url: f"{sig:016x}" for url, sig in self.signatures.items()}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,361 @@
+"""
+HarmonyOS NEXT UI/UX Pro Max Skill - 可恢复下载
+各抓取脚本共用的大文件下载器: HTTP Range 断点续传、大文件分段并行下载、大小与哈希校验
+"""
+
+import os
+import json
+import time
+import base64
+import shutil
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from tqdm import tqdm
+
+CHUNK_SIZE = 256 * 1024
+# 服务器支持 Range 且文件不小于该大小时分段并行下载
+SEGMENT_MIN_SIZE = 16 * 1024 * 1024
+# 分段数
+DEFAULT_SEGMENTS = 4
+
+# 保护共享进度条的总量与已下载量
+_progress_lock = threading.Lock()
+
+
+class DownloadError(Exception):
+    """下载失败 (重试耗尽或校验不通过)"""
+
+
+class RangeIgnored(Exception):
+    """服务器对 Range 请求返回了完整响应 (不支持或资源已变化)"""
+
+
+@dataclass
+class RemoteFile:
+    """HEAD 探测到的远程文件信息"""
+    size: Optional[int] = None
+    accept_ranges: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def parse_integrity(integrity: str) -> Optional[Tuple[str, str]]:
+    """
+    解析 Subresource Integrity 字符串 (如 npm 的 dist.integrity)
+
+    Args:
+        integrity: "sha512-<base64>"，多个值以空格分隔
+
+    Returns:
+        (算法, 十六进制摘要)，没有可用的算法时为 None
+    """
+    for item in integrity.split():
+        algorithm, _, value = item.partition('-')
+        if algorithm in hashlib.algorithms_available and value:
+            try:
+                return algorithm, base64.b64decode(value).hex()
+            except ValueError:
+                continue
+    return None
+
+
+def update_progress(progress: tqdm, downloaded: int = 0, total: int = 0) -> None:
+    """线程安全地更新进度条 (多个下载可共用一个进度条；total 为新增的总字节数)"""
+    with _progress_lock:
+        if total:
+            progress.total = (progress.total or 0) + total
+            progress.refresh()
+        if downloaded:
+            progress.update(downloaded)
+
+
+class Downloader:
+    """
+    可恢复的文件下载器
+
+    服务器支持 Range 时，数据先写入 parts_dir 中按 URL 命名的分段文件，
+    失败重试 (包括下一次运行) 从已有字节处继续；大文件拆成多个分段并行下载。
+    分段元数据记录 ETag / 大小，远程文件变化时丢弃旧分段。下载完成后校验
+    大小与 (可选的) 哈希，再原子移动到目标路径，并登记到会话的 HTTP 缓存，
+    之后的运行通过条件请求 (304) 直接复用。不支持 Range 的服务器退回整体下载。
+    """
+
+    def __init__(self, session: requests.Session, parts_dir: Path, max_retries: int = 3,
+                 timeout: float = 30, retry_delay: float = 1, segments: int = DEFAULT_SEGMENTS,
+                 segment_min_size: int = SEGMENT_MIN_SIZE, metrics=None):
+        """
+        Args:
+            session: 会话 (CachedSession 时复用其 HTTP 缓存)
+            parts_dir: 未完成分段的存放目录
+            max_retries: 每个分段的最大尝试次数
+            timeout: 单个请求超时 (秒)
+            retry_delay: 重试间隔 (秒)
+            segments: 大文件的并行分段数
+            segment_min_size: 分段下载的最小文件大小
+            metrics: 记录重试次数的 CrawlMetrics (可选)
+        """
+        self.session = session
+        self.parts_dir = parts_dir
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.segments = max(1, segments)
+        self.segment_min_size = segment_min_size
+        self.metrics = metrics
+
+    def probe(self, url: str, headers: Optional[Dict] = None) -> RemoteFile:
+        """
+        用 HEAD 请求获取远程文件的大小、验证器与 Range 支持 (跟随重定向)
+
+        之后的分段请求仍发往原 URL (由会话跟随重定向)，与缓存键及回放改写保持一致。
+
+        探测失败时返回未知信息，由 download 退回整体下载。
+        """
+        try:
+            response = self.session.head(url, headers=headers, timeout=self.timeout, allow_redirects=True)
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            return RemoteFile()
+        length = response.headers.get("Content-Length", "")
+        encoding = response.headers.get("Content-Encoding", "identity")
+        return RemoteFile(
+            size=int(length) if length.isdigit() and encoding == "identity" else None,
+            accept_ranges=response.headers.get("Accept-Ranges", "").lower() == "bytes",
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            headers=dict(response.headers),
+        )
+
+    def download(self, url: str, output_path: Path, headers: Optional[Dict] = None,
+                 digest: Optional[Tuple[str, str]] = None, progress: Optional[tqdm] = None,
+                 cache: bool = True) -> None:
+        """
+        下载文件到 output_path
+
+        Args:
+            url: 下载 URL
+            output_path: 输出路径
+            headers: 请求头
+            digest: 期望的 (哈希算法, 十六进制摘要)，如 parse_integrity 的结果
+            progress: 多个下载共用的进度条 (None 表示为该文件单独显示进度)
+            cache: 是否经过会话的 HTTP 缓存 (大体积压缩包应传 False，避免同时在缓存中再存一份)
+
+        Raises:
+            DownloadError: 重试耗尽或校验不通过
+        """
+        headers = dict(headers or {})
+        own_progress = progress is None
+        if own_progress:
+            progress = tqdm(total=0, unit='B', unit_scale=True, desc=output_path.name)
+        try:
+            remote = self.probe(url, headers)
+            cache_is_current = cache and self._cache_is_current(url, remote)
+            if remote.accept_ranges and remote.size and not cache_is_current:
+                try:
+                    self._download_ranged(url, remote, output_path, headers, digest, progress, cache)
+                    return
+                except RangeIgnored:
+                    self._discard_parts(url)
+            self._download_whole(url, output_path, headers, digest, progress, cache)
+        finally:
+            if own_progress:
+                progress.close()
+
+    def _cache_is_current(self, url: str, remote: RemoteFile) -> bool:
+        """会话的 HTTP 缓存中是否已有与远程文件相同的版本 (条件请求即可得到)"""
+        cache = getattr(self.session, "cache", None)
+        entry = cache.lookup(url) if cache is not None else None
+        if not entry:
+            return False
+        if remote.etag:
+            return entry.get("etag") == remote.etag
+        return bool(remote.last_modified) and entry.get("last_modified") == remote.last_modified
+
+    def _download_whole(self, url: str, output_path: Path, headers: Dict,
+                        digest: Optional[Tuple[str, str]], progress: tqdm, cache: bool = True) -> None:
+        """普通 GET 整体下载 (cache 为 True 时经过会话的 HTTP 缓存；失败或校验不通过时从头重试)"""
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        # 只有 CachedSession 接受 cache 参数
+        get_kwargs = {} if cache or not hasattr(self.session, "cache") else {"cache": False}
+        last_error = None
+        for attempt in range(self.max_retries):
+            written = total = 0
+            try:
+                with self.session.get(url, headers=headers, timeout=self.timeout, stream=True,
+                                      **get_kwargs) as response:
+                    response.raise_for_status()
+                    if response.status_code != 200:
+                        # 206 等只包含部分内容的响应不能当作完整文件
+                        raise DownloadError(f"意外的响应状态 {response.status_code}")
+                    total = int(response.headers.get("Content-Length") or 0)
+                    update_progress(progress, total=total)
+                    with open(tmp_path, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            if chunk:
+                                f.write(chunk)
+                                written += len(chunk)
+                                update_progress(progress, downloaded=len(chunk))
+                if total and written != total:
+                    raise DownloadError(f"大小不符: 期望 {total} 字节，实际 {written} 字节")
+                self._verify([tmp_path], digest)
+                os.replace(tmp_path, output_path)
+                return
+            except (requests.exceptions.RequestException, DownloadError) as e:
+                # 大小或哈希不符 (如连接被截断、代理返回了错误内容) 与网络错误一样重试
+                last_error = e
+                # 撤销本次失败尝试计入进度条的字节
+                update_progress(progress, downloaded=-written, total=-total)
+                if attempt < self.max_retries - 1:
+                    self._record_retry(url)
+                    time.sleep(self.retry_delay)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+        raise DownloadError(f"下载失败 (已尝试 {self.max_retries} 次): {last_error}")
+
+    def _download_ranged(self, url: str, remote: RemoteFile, output_path: Path, headers: Dict,
+                         digest: Optional[Tuple[str, str]], progress: tqdm, cache: bool = True) -> None:
+        """按 Range 分段下载 (可续传)，合并校验后移动到目标路径"""
+        count = self.segments if remote.size >= self.segment_min_size else 1
+        bounds = _segment_bounds(remote.size, count)
+        parts = self._prepare_parts(url, remote, len(bounds))
+
+        update_progress(progress, total=remote.size)
+        update_progress(progress, downloaded=sum(p.stat().st_size for p in parts if p.exists()))
+
+        if len(parts) == 1:
+            self._download_segment(url, remote, parts[0], *bounds[0], headers, progress)
+        else:
+            with ThreadPoolExecutor(max_workers=len(parts), thread_name_prefix="segment") as executor:
+                futures = [
+                    executor.submit(self._download_segment, url, remote, part, start, end, headers, progress)
+                    for part, (start, end) in zip(parts, bounds)
+                ]
+                for future in futures:
+                    future.result()
+
+        size = sum(p.stat().st_size for p in parts)
+        if size != remote.size:
+            self._discard_parts(url)
+            raise DownloadError(f"大小不符: 期望 {remote.size} 字节，实际 {size} 字节")
+        try:
+            self._verify(parts, digest)
+        except DownloadError:
+            self._discard_parts(url)
+            raise
+
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        if len(parts) == 1:
+            shutil.move(str(parts[0]), tmp_path)
+        else:
+            with open(tmp_path, 'wb') as out:
+                for part in parts:
+                    with open(part, 'rb') as f:
+                        shutil.copyfileobj(f, out, CHUNK_SIZE)
+        os.replace(tmp_path, output_path)
+        self._discard_parts(url)
+
+        http_cache = getattr(self.session, "cache", None) if cache else None
+        if http_cache is not None and (remote.etag or remote.last_modified):
+            http_cache.store_file(url, output_path, remote.headers)
+
+    def _download_segment(self, url: str, remote: RemoteFile, part: Path, start: int, end: int,
+                          headers: Dict, progress: tqdm) -> None:
+        """下载 [start, end] 字节到分段文件，从分段已有的字节处继续"""
+        last_error = None
+        for attempt in range(self.max_retries):
+            offset = start + (part.stat().st_size if part.exists() else 0)
+            if offset > end:
+                return
+            segment_headers = dict(headers, Range=f"bytes={offset}-{end}")
+            if remote.etag and not remote.etag.startswith("W/"):
+                # 远程文件已变化时服务器返回 200 完整响应，而不是拼接到旧数据上
+                segment_headers["If-Range"] = remote.etag
+            try:
+                with self.session.get(url, headers=segment_headers,
+                                      timeout=self.timeout, stream=True) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise RangeIgnored(url)
+                    with open(part, 'ab') as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            if chunk:
+                                f.write(chunk)
+                                update_progress(progress, downloaded=len(chunk))
+                if start + part.stat().st_size > end:
+                    return
+            except requests.exceptions.RequestException as e:
+                last_error = e
+            if attempt < self.max_retries - 1:
+                self._record_retry(url)
+                time.sleep(self.retry_delay)
+        raise DownloadError(f"分段 {start}-{end} 下载失败 (已尝试 {self.max_retries} 次): {last_error}")
+
+    def _parts_key(self, url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]
+
+    def _prepare_parts(self, url: str, remote: RemoteFile, count: int) -> List[Path]:
+        """
+        分段文件路径；已有分段与远程文件 (大小 / ETag / 分段数) 不符时先丢弃
+
+        Returns:
+            各分段文件路径
+        """
+        key = self._parts_key(url)
+        meta_path = self.parts_dir / f"{key}.json"
+        meta = {
+            "url": url,
+            "size": remote.size,
+            "etag": remote.etag,
+            "last_modified": remote.last_modified,
+            "segments": count,
+        }
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                current = json.load(f)
+        except (OSError, ValueError):
+            current = None
+        if current != meta:
+            self._discard_parts(url)
+            self.parts_dir.mkdir(parents=True, exist_ok=True)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+        return [self.parts_dir / f"{key}.part{i}" for i in range(count)]
+
+    def _discard_parts(self, url: str) -> None:
+        """删除 URL 的分段文件与元数据"""
+        key = self._parts_key(url)
+        if not self.parts_dir.exists():
+            return
+        for path in self.parts_dir.glob(f"{key}.*"):
+            path.unlink()
+
+    def _verify(self, paths: List[Path], digest: Optional[Tuple[str, str]]) -> None:
+        """按顺序读取文件 (分段) 校验哈希"""
+        if digest is None:
+            return
+        algorithm, expected = digest
+        hasher = hashlib.new(algorithm)
+        for path in paths:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+        if hasher.hexdigest() != expected.lower():
+            raise DownloadError(f"{algorithm} 校验失败: 期望 {expected}，实际 {hasher.hexdigest()}")
+
+    def _record_retry(self, url: str) -> None:
+        if self.metrics is not None:
+            self.metrics.record_retry(url)
+
+
+def _segment_bounds(size: int, count: int) -> List[Tuple[int, int]]:
+    """把 [0, size) 均分为 count 段，返回各段的 (起始, 结束) 字节 (含结束)"""
+    step = -(-size // count)
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
@@ -6,27 +6,60 @@ HarmonyOS NEXT UI/UX Pro Max Skill - GitHub/Gitee 组件抓取脚本
 import os
 import sys
 import json
-import time
+import zlib
 import shutil
 import zipfile
+import argparse
 import tempfile
-from pathlib import Path
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import List, Dict, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 
-import requests
 from tqdm import tqdm
 from colorama import init, Fore, Style
 
 from config import (
     GITHUB_REPOS, GITEE_REPOS, GITHUB_OUTPUT_DIR,
     REQUEST_TIMEOUT, MAX_RETRIES, REQUEST_DELAY,
-    DEFAULT_HEADERS, SOURCE_FILE_EXTENSIONS, IGNORE_DIRS
+    DEFAULT_HEADERS, HTTP_CACHE_DIR, SOURCE_FILE_EXTENSIONS, IGNORE_DIRS,
+    METRICS_DIR, METRICS_PROMETHEUS, DOWNLOAD_PARTS_DIR, COMPONENT_CACHE_PATH
 )
+from http_cache import create_session
+from crawl_metrics import CrawlMetrics
+from downloader import Downloader, DownloadError
+from analysis_pool import AnalysisPool, DEFAULT_JOBS
 
 # 初始化 colorama
 init()
 
+# 共享的 HTTP 会话 (带 ETag/Last-Modified 磁盘缓存)
+session = create_session(HTTP_CACHE_DIR, DEFAULT_HEADERS)
+
+# 本次运行的抓取指标 (请求、缓存命中、重试、阶段耗时)
+metrics = CrawlMetrics("fetch_github_components")
+metrics.instrument(session)
+
+# 可续传的下载器 (分段文件存放于 DOWNLOAD_PARTS_DIR)
+downloader = Downloader(
+    session, DOWNLOAD_PARTS_DIR, max_retries=MAX_RETRIES,
+    timeout=REQUEST_TIMEOUT, retry_delay=REQUEST_DELAY, metrics=metrics
+)
+
+# 并行下载的仓库数
+DOWNLOAD_WORKERS = 4
+# 同一主机同时进行的下载数上限
+MAX_DOWNLOADS_PER_HOST = 2
+
+# 组件缓存格式版本 (组件分析逻辑变化时递增，旧缓存整体失效)
+COMPONENT_CACHE_VERSION = 1
+
+# 主机 -> 下载名额
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
 
 def log_info(message: str):
     """打印信息日志"""
@@ -53,64 +86,56 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def download_file(url: str, output_path: Path, headers: Dict = None) -> bool:
+def host_slot(url: str) -> threading.BoundedSemaphore:
+    """URL 所属主机的下载名额 (限制同一主机的并发下载数)"""
+    host = urlparse(url).netloc
+    with _host_slots_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(MAX_DOWNLOADS_PER_HOST)
+        return _host_slots[host]
+
+
+def download_file(url: str, output_path: Path, headers: Dict = None,
+                  progress: Optional[tqdm] = None) -> bool:
     """
-    下载文件
+    下载文件 (支持断点续传，大文件分段并行下载，见 downloader.py)
     
     Args:
         url: 下载 URL
         output_path: 输出路径
         headers: 请求头
+        progress: 多个下载共用的进度条 (None 表示为该文件单独显示进度)
     
     Returns:
         是否下载成功
     """
     headers = headers or DEFAULT_HEADERS.copy()
     
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = requests.get(
-                url, 
-                headers=headers, 
-                timeout=REQUEST_TIMEOUT,
-                stream=True
-            )
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            
-            with open(output_path, 'wb') as f:
-                if total_size > 0:
-                    with tqdm(total=total_size, unit='B', unit_scale=True, desc=output_path.name) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-            
-            return True
-            
-        except requests.exceptions.RequestException as e:
-            log_warning(f"下载失败 (尝试 {attempt + 1}/{MAX_RETRIES}): {e}")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(REQUEST_DELAY)
-    
-    return False
-
-
-def download_github_repo(repo_info: Dict, output_dir: Path) -> bool:
+    try:
+        with host_slot(url):
+            downloader.download(url, output_path, headers=headers, progress=progress, cache=False)
+        return True
+    except DownloadError as e:
+        log_warning(f"下载失败 {url}: {e}")
+        return False
+
+
+def download_github_repo(repo_info: Dict, output_dir: Path,
+                         progress: Optional[tqdm] = None,
+                         file_cache: Optional[Dict[str, Dict]] = None,
+                         pool: Optional[AnalysisPool] = None) -> Optional[List[Dict]]:
     """
-    下载 GitHub 仓库
+    下载 GitHub 仓库，只解压其中的源码文件并提取组件信息
     
     Args:
         repo_info: 仓库信息
         output_dir: 输出目录
+        progress: 多个下载共用的进度条
+        file_cache: 该仓库的文件级组件缓存 (见 extract_repo_archive，就地更新)
+        pool: 分析进程池 (None 表示在下载线程中串行分析)
     
     Returns:
-        是否下载成功
+        提取的组件列表，下载或解压失败时为 None
     """
     name = repo_info["name"]
     url = repo_info["url"]
@@ -124,7 +149,7 @@ def download_github_repo(repo_info: Dict, output_dir: Path) -> bool:
     
     if len(path_parts) < 2:
         log_error(f"无效的仓库 URL: {url}")
-        return False
+        return None
     
     owner, repo = path_parts[0], path_parts[1]
     
@@ -135,91 +160,338 @@ def download_github_repo(repo_info: Dict, output_dir: Path) -> bool:
         zip_url = f"https://gitee.com/{owner}/{repo}/repository/archive/{branch}.zip"
     else:
         log_error(f"不支持的仓库托管平台: {url}")
-        return False
+        return None
     
-    # 创建临时目录
+    # 创建临时目录 (只存放 ZIP 文件)
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
         zip_path = temp_path / f"{name}.zip"
         
         # 下载 ZIP 文件
-        if not download_file(zip_url, zip_path):
+        with metrics.stage("download"):
+            downloaded = download_file(zip_url, zip_path, progress=progress)
+        if not downloaded:
             log_error(f"下载仓库失败: {name}")
-            return False
+            return None
         
-        # 解压 ZIP 文件
+        # 只解压源码文件，同时在内存中提取组件信息
         try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_path)
-            
-            # 找到解压后的目录
-            extracted_dirs = [d for d in temp_path.iterdir() if d.is_dir()]
-            if not extracted_dirs:
-                log_error(f"解压后未找到目录: {name}")
-                return False
-            
-            extracted_dir = extracted_dirs[0]
-            
-            # 移动到输出目录
-            repo_output_dir = output_dir / name
-            if repo_output_dir.exists():
-                shutil.rmtree(repo_output_dir)
-            
-            shutil.move(str(extracted_dir), str(repo_output_dir))
-            
-            log_success(f"仓库下载完成: {name}")
-            return True
-            
+            with metrics.stage("extract"):
+                components = extract_repo_archive(zip_path, output_dir / name, file_cache, pool)
         except zipfile.BadZipFile as e:
             log_error(f"解压失败: {e}")
-            return False
+            return None
+        
+        log_success(f"仓库下载完成: {name}")
+        return components
+
+
+def iter_source_members(zip_ref: zipfile.ZipFile) -> Iterator[Tuple[zipfile.ZipInfo, PurePosixPath]]:
+    """
+    ZIP 中需要解压的源码成员
+    
+    跳过目录、IGNORE_DIRS 中的目录 (按路径分段判断) 以及扩展名不在
+    SOURCE_FILE_EXTENSIONS 中的文件 (图片、构建产物等)。
+    
+    Args:
+        zip_ref: 仓库 ZIP (所有成员位于同一个顶层目录下)
+    
+    Returns:
+        (成员, 去掉顶层目录后的相对路径) 迭代器
+    """
+    for info in zip_ref.infolist():
+        if info.is_dir():
+            continue
+        parts = PurePosixPath(info.filename).parts[1:]
+        if not parts or '..' in parts or info.filename.startswith('/'):
+            continue
+        if any(part in IGNORE_DIRS for part in parts[:-1]):
+            continue
+        relative_path = PurePosixPath(*parts)
+        if relative_path.suffix in SOURCE_FILE_EXTENSIONS:
+            yield info, relative_path
+
+
+def extract_repo_archive(zip_path: Path, repo_output_dir: Path,
+                         file_cache: Optional[Dict[str, Dict]] = None,
+                         pool: Optional[AnalysisPool] = None) -> List[Dict]:
+    """
+    从仓库 ZIP 中流式解压源码文件到输出目录，并直接分析读出的内容
+    
+    每个成员只读取一次，组件分析不再重新读取磁盘上的文件；其他文件不解压。
+    file_cache 中已有该仓库的记录且仓库目录存在时增量同步: 内容哈希未变且
+    磁盘上文件完好的成员既不解压也不重新分析，只写入变化的成员并删除上游已删除
+    的文件；否则先解压到同级临时目录，完成后替换旧的仓库目录。
+    需要分析的成员内容按批交给分析进程池，结果按归档顺序合并。
+    
+    Args:
+        zip_path: 仓库 ZIP 文件
+        repo_output_dir: 仓库输出目录
+        file_cache: 相对路径 -> {"hash", "components"}，就地更新 (None 表示不使用缓存)
+        pool: 分析进程池 (None 表示在当前线程中串行分析)
+    
+    Returns:
+        提取的组件列表 (顺序与归档中一致)
+    """
+    if file_cache is None:
+        file_cache = {}
+    incremental = bool(file_cache) and repo_output_dir.is_dir()
+    staging_dir = repo_output_dir.with_name(f".{repo_output_dir.name}.tmp")
+    target_dir = repo_output_dir if incremental else staging_dir
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    
+    pool = pool or AnalysisPool(jobs=1)
+    # 本次归档对应的缓存，全部成功后才替换 file_cache，中途失败不会留下与磁盘不符的记录
+    new_cache: Dict[str, Dict] = {}
+    changed = 0
+    # 待分析的成员: (相对路径, 内容)；攒够一轮 (每个进程一批) 再提交，限制驻留内存的内容量
+    pending: List[Tuple[str, bytes]] = []
+    flush_size = pool.jobs * pool.batch_size
+    
+    def flush():
+        results = pool.map(analyze_archive_member, pending)
+        for (relative_name, _), component_names in zip(pending, results):
+            new_cache[relative_name]["components"] = component_names
+        pending.clear()
+    
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for info, relative_path in iter_source_members(zip_ref):
+                relative_name = str(Path(*relative_path.parts))
+                target = target_dir.joinpath(*relative_path.parts)
+                digest = archive_member_hash(info)
+                
+                entry = file_cache.get(relative_name)
+                cached = entry is not None and entry.get("hash") == digest
+                if not (cached and incremental and _file_size(target) == info.file_size):
+                    data = zip_ref.read(info)
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(data)
+                    
+                    if not cached:
+                        changed += 1
+                        entry = {"hash": digest, "components": []}
+                        pending.append((relative_name, data))
+                
+                new_cache[relative_name] = entry
+                if len(pending) >= flush_size:
+                    flush()
+            flush()
+        
+        if incremental:
+            # 删除上游已删除的源码文件
+            for file_path in iter_source_files(repo_output_dir):
+                if str(file_path.relative_to(repo_output_dir)) not in new_cache:
+                    file_path.unlink()
+        else:
+            if repo_output_dir.exists():
+                shutil.rmtree(repo_output_dir)
+            staging_dir.mkdir(parents=True, exist_ok=True)
+            staging_dir.rename(repo_output_dir)
+    finally:
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+    
+    file_cache.clear()
+    file_cache.update(new_cache)
+    log_info(f"{repo_output_dir.name}: {len(new_cache)} 个源码文件，其中 {changed} 个需要重新分析")
+    return [
+        {"file": relative_name, "components": entry["components"],
+         "path": str(repo_output_dir / relative_name)}
+        for relative_name, entry in new_cache.items() if entry["components"]
+    ]
+
+
+def archive_member_hash(info: zipfile.ZipInfo) -> str:
+    """
+    ZIP 成员的内容哈希 (CRC32 + 大小)
+    
+    CRC32 已记录在 ZIP 中央目录中，无需解压即可判断成员内容是否变化；
+    与 content_hash() 对同一内容的结果相同。
+    """
+    return f"{info.CRC:08x}:{info.file_size}"
+
+
+def content_hash(data: bytes) -> str:
+    """文件内容哈希 (CRC32 + 大小)，与 archive_member_hash() 一致"""
+    return f"{zlib.crc32(data):08x}:{len(data)}"
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return -1
+
+
+def analyze_archive_member(member: Tuple[str, bytes]) -> List[str]:
+    """分析一个 ZIP 成员 (相对路径, 内容)，在分析进程池中执行，须为模块级函数"""
+    relative_path, data = member
+    return analyze_source_bytes(data, relative_path)
+
+
+def analyze_source_bytes(data: bytes, relative_path: str) -> List[str]:
+    """
+    分析源码文件内容
+    
+    Args:
+        data: 文件内容
+        relative_path: 相对仓库根目录的路径 (用于日志)
+    
+    Returns:
+        组件名称列表，没有组件定义或无法解码时为空
+    """
+    try:
+        content = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        log_warning(f"读取文件失败 {relative_path}: {e}")
+        return []
+    
+    component_info = analyze_source_file(content, relative_path, Path(relative_path))
+    return component_info["components"] if component_info else []
 
 
-def extract_components(repo_dir: Path, output_dir: Path) -> List[Dict]:
+def extract_components(repo_dir: Path, output_dir: Path,
+                       pool: Optional[AnalysisPool] = None,
+                       file_cache: Optional[Dict[str, Dict]] = None) -> List[Dict]:
     """
     从仓库中提取组件信息
     
+    只有内容哈希与 file_cache 中记录不同的文件才交给分析进程池。
+    
     Args:
         repo_dir: 仓库目录
         output_dir: 输出目录
+        pool: 分析进程池 (None 表示在当前进程中串行分析)
+        file_cache: 相对路径 -> {"hash", "components"}，就地更新 (None 表示不使用缓存)
     
     Returns:
-        提取的组件列表
+        提取的组件列表 (顺序与串行分析相同)
     """
-    components = []
+    if file_cache is None:
+        file_cache = {}
     
-    # 遍历所有源码文件
-    for ext in SOURCE_FILE_EXTENSIONS:
-        for file_path in repo_dir.rglob(f"*{ext}"):
-            # 跳过忽略的目录
-            if any(ignore_dir in str(file_path) for ignore_dir in IGNORE_DIRS):
-                continue
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # 检查是否包含组件定义
-                if '@Component' in content or 'struct' in content:
-                    relative_path = file_path.relative_to(repo_dir)
-                    
-                    # 提取组件名称
-                    component_names = extract_component_names(content)
-                    
-                    if component_names:
-                        component_info = {
-                            "file": str(relative_path),
-                            "components": component_names,
-                            "path": str(file_path)
-                        }
-                        components.append(component_info)
-                        
-            except Exception as e:
-                log_warning(f"读取文件失败 {file_path}: {e}")
+    # 遍历所有源码文件 (一次遍历，忽略的目录不进入)，计算内容哈希
+    files: Dict[str, Path] = {}
+    hashes: Dict[str, str] = {}
+    for file_path in iter_source_files(repo_dir):
+        relative_name = str(file_path.relative_to(repo_dir))
+        try:
+            hashes[relative_name] = content_hash(file_path.read_bytes())
+        except OSError as e:
+            log_warning(f"读取文件失败 {file_path}: {e}")
+            continue
+        files[relative_name] = file_path
+    
+    for relative_name in set(file_cache) - set(files):
+        del file_cache[relative_name]
+    changed = [
+        relative_name for relative_name in files
+        if file_cache.get(relative_name, {}).get("hash") != hashes[relative_name]
+    ]
+    log_info(f"{repo_dir.name}: {len(files)} 个源码文件，其中 {len(changed)} 个需要重新分析")
     
+    pool = pool or AnalysisPool(jobs=1)
+    results = pool.map(partial(analyze_file, repo_dir=repo_dir), [files[name] for name in changed])
+    for relative_name, component_names in zip(changed, results):
+        if component_names is None:
+            file_cache.pop(relative_name, None)
+        else:
+            file_cache[relative_name] = {"hash": hashes[relative_name], "components": component_names}
+    
+    components = []
+    for relative_name, file_path in files.items():
+        component_names = file_cache.get(relative_name, {}).get("components")
+        if component_names:
+            components.append({"file": relative_name, "components": component_names, "path": str(file_path)})
     return components
 
 
+def analyze_file(file_path: Path, repo_dir: Path) -> Optional[List[str]]:
+    """
+    读取并分析单个源码文件 (在分析进程池中执行，须为模块级函数)
+    
+    Args:
+        file_path: 文件路径
+        repo_dir: 仓库目录
+    
+    Returns:
+        组件名称列表 (没有组件定义时为空)，读取失败时为 None (不写入缓存)
+    """
+    try:
+        data = file_path.read_bytes()
+    except OSError as e:
+        log_warning(f"读取文件失败 {file_path}: {e}")
+        return None
+    
+    return analyze_source_bytes(data, str(file_path.relative_to(repo_dir)))
+
+
+def iter_source_files(root: Path) -> Iterator[Path]:
+    """
+    单次遍历目录树，产出扩展名在 SOURCE_FILE_EXTENSIONS 中的文件
+    
+    基于 os.scandir：IGNORE_DIRS 中的目录在进入前剪枝，文件按扩展名分派，
+    不跟随符号链接。同一目录内按名称排序，结果顺序稳定。
+    
+    Args:
+        root: 根目录
+    
+    Returns:
+        文件路径迭代器
+    """
+    extensions = set(SOURCE_FILE_EXTENSIONS)
+    ignored = set(IGNORE_DIRS)
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            log_warning(f"读取目录失败 {directory}: {e}")
+            continue
+        
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in ignored:
+                    subdirs.append(Path(entry.path))
+            elif os.path.splitext(entry.name)[1] in extensions and entry.is_file(follow_symlinks=False):
+                yield Path(entry.path)
+        # 逆序入栈，按名称顺序深度优先遍历
+        stack.extend(reversed(subdirs))
+
+
+def analyze_source_file(content: str, relative_path: str, file_path: Path) -> Optional[Dict]:
+    """
+    分析单个源码文件
+    
+    Args:
+        content: 文件内容
+        relative_path: 相对仓库根目录的路径
+        file_path: 文件在输出目录中的路径
+    
+    Returns:
+        组件信息，文件中没有组件定义时为 None
+    """
+    # 检查是否包含组件定义
+    if '@Component' not in content and 'struct' not in content:
+        return None
+    
+    # 提取组件名称
+    component_names = extract_component_names(content)
+    if not component_names:
+        return None
+    
+    return {
+        "file": relative_path,
+        "components": component_names,
+        "path": str(file_path)
+    }
+
+
 def extract_component_names(content: str) -> List[str]:
     """
     从代码内容中提取组件名称
@@ -249,6 +521,40 @@ def extract_component_names(content: str) -> List[str]:
     return names
 
 
+def load_component_cache(path: Path) -> Dict[str, Dict[str, Dict]]:
+    """
+    读取组件缓存
+    
+    Args:
+        path: 缓存文件路径
+    
+    Returns:
+        仓库名 -> (相对路径 -> {"hash", "components"})；文件不存在、损坏或版本不符时为空
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != COMPONENT_CACHE_VERSION:
+        return {}
+    return data.get("repos", {})
+
+
+def save_component_cache(cache: Dict[str, Dict[str, Dict]], path: Path) -> None:
+    """
+    写入组件缓存 (先写临时文件再替换)
+    
+    Args:
+        cache: 仓库名 -> (相对路径 -> {"hash", "components"})
+        path: 缓存文件路径
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": COMPONENT_CACHE_VERSION, "repos": cache}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
 def generate_component_index(components: List[Dict], output_path: Path) -> None:
     """
     生成组件索引文件
@@ -271,6 +577,14 @@ def generate_component_index(components: List[Dict], output_path: Path) -> None:
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="HarmonyOS NEXT UI/UX Pro Max Skill - GitHub 组件抓取")
+    parser.add_argument("--reindex", action="store_true",
+                        help="不下载，只重新分析已下载的仓库目录")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"组件分析进程数 (默认: CPU 核数 {DEFAULT_JOBS})；"
+                             "下载时各下载线程共用同一个进程池")
+    args = parser.parse_args()
+    
     log_info("=" * 60)
     log_info("HarmonyOS NEXT UI/UX Pro Max Skill - GitHub 组件抓取")
     log_info("=" * 60)
@@ -278,45 +592,76 @@ def main():
     # 确保输出目录存在
     ensure_dir(GITHUB_OUTPUT_DIR)
     
-    all_components = []
+    repos = GITHUB_REPOS + GITEE_REPOS
+    repo_components: Dict[str, List[Dict]] = {}
     
-    # 下载 GitHub 仓库
-    log_info("\n正在下载 GitHub 仓库...")
-    for repo_info in GITHUB_REPOS:
-        if download_github_repo(repo_info, GITHUB_OUTPUT_DIR):
-            repo_dir = GITHUB_OUTPUT_DIR / repo_info["name"]
-            components = extract_components(repo_dir, GITHUB_OUTPUT_DIR)
-            
-            log_info(f"从 {repo_info['name']} 提取了 {len(components)} 个组件文件")
-            
-            for comp in components:
-                comp["source"] = repo_info["name"]
-            all_components.extend(components)
-        
-        time.sleep(REQUEST_DELAY)
-    
-    # 下载 Gitee 仓库
-    log_info("\n正在下载 Gitee 仓库...")
-    for repo_info in GITEE_REPOS:
-        if download_github_repo(repo_info, GITHUB_OUTPUT_DIR):
-            repo_dir = GITHUB_OUTPUT_DIR / repo_info["name"]
-            components = extract_components(repo_dir, GITHUB_OUTPUT_DIR)
-            
-            log_info(f"从 {repo_info['name']} 提取了 {len(components)} 个组件文件")
-            
-            for comp in components:
-                comp["source"] = repo_info["name"]
-            all_components.extend(components)
-        
-        time.sleep(REQUEST_DELAY)
+    # 文件级组件缓存: 每个仓库一个字典，由处理该仓库的线程就地更新
+    component_cache = load_component_cache(COMPONENT_CACHE_PATH)
+    component_cache = {repo_info["name"]: component_cache.get(repo_info["name"], {}) for repo_info in repos}
+    
+    if args.reindex:
+        log_info(f"\n正在重新分析 {len(repos)} 个已下载的仓库...")
+        with AnalysisPool(args.jobs) as pool:
+            for repo_info in repos:
+                repo_dir = GITHUB_OUTPUT_DIR / repo_info["name"]
+                if not repo_dir.is_dir():
+                    log_warning(f"仓库目录不存在: {repo_dir}")
+                    continue
+                with metrics.stage("extract"):
+                    repo_components[repo_info["name"]] = extract_components(
+                        repo_dir, GITHUB_OUTPUT_DIR, pool, component_cache[repo_info["name"]]
+                    )
+    else:
+        # 并行下载 GitHub/Gitee 仓库 (同一主机限制并发)；每个仓库下载完成后立即
+        # 在同一线程中解压，变化的文件交给共用的分析进程池，与其余仓库的下载重叠进行
+        log_info(f"\n正在下载 {len(repos)} 个 GitHub/Gitee 仓库...")
+        with AnalysisPool(args.jobs) as pool:
+            # 在启动下载线程之前创建工作进程
+            pool.start()
+            with tqdm(total=0, unit='B', unit_scale=True, desc="下载仓库") as progress, \
+                    ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="download") as executor:
+                futures = {
+                    executor.submit(
+                        download_github_repo, repo_info, GITHUB_OUTPUT_DIR, progress,
+                        component_cache[repo_info["name"]], pool
+                    ): repo_info
+                    for repo_info in repos
+                }
+                for finished, future in enumerate(as_completed(futures), 1):
+                    repo_info = futures[future]
+                    progress.set_postfix_str(f"{finished}/{len(repos)} 个仓库")
+                    try:
+                        components = future.result()
+                    except Exception as e:
+                        log_error(f"下载仓库失败 {repo_info['name']}: {e}")
+                        continue
+                    if components is not None:
+                        repo_components[repo_info["name"]] = components
+    
+    save_component_cache(component_cache, COMPONENT_CACHE_PATH)
+    
+    for name, components in repo_components.items():
+        log_info(f"从 {name} 提取了 {len(components)} 个组件文件")
+        for comp in components:
+            comp["source"] = name
+    
+    # 按配置顺序合并，索引与下载完成的先后无关
+    all_components = []
+    for repo_info in repos:
+        all_components.extend(repo_components.get(repo_info["name"], []))
     
     # 生成组件索引
     if all_components:
         index_path = GITHUB_OUTPUT_DIR / "component_index.json"
-        generate_component_index(all_components, index_path)
+        with metrics.stage("index"):
+            generate_component_index(all_components, index_path)
+    
+    metrics_path = METRICS_DIR / "fetch_github_components.json"
+    metrics.write(metrics_path, prometheus=METRICS_PROMETHEUS)
     
     log_info("\n" + "=" * 60)
     log_success(f"抓取完成! 共提取 {len(all_components)} 个组件文件")
+    log_info(f"指标报告: {metrics_path}")
     log_info("=" * 60)
 
 
@@ -7,25 +7,43 @@ import os
 import sys
 import json
 import time
+import argparse
 import tarfile
 import tempfile
 import re
 from pathlib import Path
+from functools import partial
 from typing import List, Dict, Optional, Tuple
 
 import requests
-from tqdm import tqdm
 from colorama import init, Fore, Style
 
 from config import (
     NPM_PACKAGES, COMPONENTS_OUTPUT_DIR,
     REQUEST_TIMEOUT, MAX_RETRIES, REQUEST_DELAY,
-    DEFAULT_HEADERS
+    DEFAULT_HEADERS, HTTP_CACHE_DIR, METRICS_DIR, METRICS_PROMETHEUS, DOWNLOAD_PARTS_DIR
 )
+from http_cache import create_session
+from crawl_metrics import CrawlMetrics
+from downloader import Downloader, DownloadError, parse_integrity
+from analysis_pool import AnalysisPool, DEFAULT_JOBS
 
 # 初始化 colorama
 init()
 
+# 共享的 HTTP 会话 (带 ETag/Last-Modified 磁盘缓存)
+session = create_session(HTTP_CACHE_DIR, DEFAULT_HEADERS)
+
+# 本次运行的抓取指标 (请求、缓存命中、重试、阶段耗时)
+metrics = CrawlMetrics("fetch_ibest_ui")
+metrics.instrument(session)
+
+# 可续传的下载器 (分段文件存放于 DOWNLOAD_PARTS_DIR)
+downloader = Downloader(
+    session, DOWNLOAD_PARTS_DIR, max_retries=MAX_RETRIES,
+    timeout=REQUEST_TIMEOUT, retry_delay=REQUEST_DELAY, metrics=metrics
+)
+
 
 def log_info(message: str):
     """打印信息日志"""
@@ -66,7 +84,7 @@ def fetch_npm_package_info(package_name: str, registry: str) -> Optional[Dict]:
     url = f"{registry}/{package_name}/latest"
     
     try:
-        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=REQUEST_TIMEOUT)
+        response = session.get(url, headers=DEFAULT_HEADERS, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -74,49 +92,29 @@ def fetch_npm_package_info(package_name: str, registry: str) -> Optional[Dict]:
         return None
 
 
-def download_npm_package(tarball_url: str, output_path: Path) -> bool:
+def download_npm_package(tarball_url: str, output_path: Path, dist: Optional[Dict] = None) -> bool:
     """
-    下载 NPM 包 tarball
+    下载 NPM 包 tarball (支持断点续传，见 downloader.py)
     
     Args:
         tarball_url: tarball 下载 URL
         output_path: 输出路径
+        dist: 包信息中的 dist 字段，用其 integrity (或 shasum) 校验下载内容
     
     Returns:
         是否下载成功
     """
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = requests.get(
-                tarball_url,
-                headers=DEFAULT_HEADERS,
-                timeout=REQUEST_TIMEOUT,
-                stream=True
-            )
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            
-            with open(output_path, 'wb') as f:
-                if total_size > 0:
-                    with tqdm(total=total_size, unit='B', unit_scale=True, desc=output_path.name) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-            
-            return True
-            
-        except requests.exceptions.RequestException as e:
-            log_warning(f"下载失败 (尝试 {attempt + 1}/{MAX_RETRIES}): {e}")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(REQUEST_DELAY)
+    dist = dist or {}
+    digest = parse_integrity(dist.get("integrity", ""))
+    if digest is None and dist.get("shasum"):
+        digest = ("sha1", dist["shasum"])
     
-    return False
+    try:
+        downloader.download(tarball_url, output_path, headers=DEFAULT_HEADERS, digest=digest, cache=False)
+        return True
+    except DownloadError as e:
+        log_warning(f"下载失败 {tarball_url}: {e}")
+        return False
 
 
 def extract_tarball(tarball_path: Path, output_dir: Path) -> bool:
@@ -139,15 +137,16 @@ def extract_tarball(tarball_path: Path, output_dir: Path) -> bool:
         return False
 
 
-def analyze_component_structure(package_dir: Path) -> Dict:
+def analyze_component_structure(package_dir: Path, pool: Optional[AnalysisPool] = None) -> Dict:
     """
     分析组件库结构
     
     Args:
         package_dir: 包目录
+        pool: 分析进程池 (None 表示在当前进程中串行分析)
     
     Returns:
-        组件结构分析结果
+        组件结构分析结果 (顺序与串行分析相同)
     """
     analysis = {
         "components": [],
@@ -158,43 +157,65 @@ def analyze_component_structure(package_dir: Path) -> Dict:
     }
     
     # 遍历目录结构
-    for item in package_dir.rglob("*"):
-        if item.is_file():
-            relative_path = str(item.relative_to(package_dir))
-            
-            if item.suffix in ['.ets', '.ts']:
-                content = ""
-                try:
-                    with open(item, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                except:
-                    pass
-                
-                # 分析组件
-                if '@Component' in content or 'struct' in content:
-                    component_info = extract_component_info(content, relative_path)
-                    if component_info:
-                        analysis["components"].append(component_info)
-                
-                # 分析主题
-                if 'theme' in relative_path.lower() or 'color' in relative_path.lower():
-                    analysis["themes"].append(relative_path)
-                
-                # 分析样式
-                if 'style' in relative_path.lower():
-                    analysis["styles"].append(relative_path)
-                
-                # 分析工具函数
-                if 'util' in relative_path.lower() or 'helper' in relative_path.lower():
-                    analysis["utils"].append(relative_path)
-                
-                # 分析类型定义
-                if 'type' in relative_path.lower() or 'interface' in content:
-                    analysis["types"].append(relative_path)
+    file_paths = [
+        item for item in package_dir.rglob("*")
+        if item.is_file() and item.suffix in ['.ets', '.ts']
+    ]
+    
+    pool = pool or AnalysisPool(jobs=1)
+    for file_analysis in pool.map(partial(analyze_package_file, package_dir=package_dir), file_paths):
+        for key, values in file_analysis.items():
+            analysis[key].extend(values)
     
     return analysis
 
 
+def analyze_package_file(item: Path, package_dir: Path) -> Dict[str, List]:
+    """
+    分析单个 .ets/.ts 文件 (在分析进程池中执行，须为模块级函数)
+    
+    Args:
+        item: 文件路径
+        package_dir: 包目录
+    
+    Returns:
+        该文件对 analysis 各分类的贡献
+    """
+    relative_path = str(item.relative_to(package_dir))
+    result = {"components": [], "themes": [], "styles": [], "utils": [], "types": []}
+    
+    content = ""
+    try:
+        with open(item, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except:
+        pass
+    
+    # 分析组件
+    if '@Component' in content or 'struct' in content:
+        component_info = extract_component_info(content, relative_path)
+        if component_info:
+            result["components"].append(component_info)
+    
+    # 分析主题
+    if 'theme' in relative_path.lower() or 'color' in relative_path.lower():
+        result["themes"].append(relative_path)
+    
+    # 分析样式
+    if 'style' in relative_path.lower():
+        result["styles"].append(relative_path)
+    
+    # 分析工具函数
+    if 'util' in relative_path.lower() or 'helper' in relative_path.lower():
+        result["utils"].append(relative_path)
+    
+    # 分析类型定义
+    if 'type' in relative_path.lower() or 'interface' in content:
+        result["types"].append(relative_path)
+    
+    return result
+
+
 def extract_component_info(content: str, file_path: str) -> Optional[Dict]:
     """
     从代码中提取组件信息
@@ -298,6 +319,11 @@ def generate_analysis_report(analysis: Dict, output_path: Path) -> None:
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="HarmonyOS NEXT UI/UX Pro Max Skill - IBest-UI 抓取")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"分析进程数 (默认: CPU 核数 {DEFAULT_JOBS})")
+    args = parser.parse_args()
+    
     log_info("=" * 60)
     log_info("HarmonyOS NEXT UI/UX Pro Max Skill - IBest-UI 抓取")
     log_info("=" * 60)
@@ -312,7 +338,8 @@ def main():
         log_info(f"\n正在处理包: {package_name}")
         
         # 获取包信息
-        npm_info = fetch_npm_package_info(package_name, registry)
+        with metrics.stage("metadata"):
+            npm_info = fetch_npm_package_info(package_name, registry)
         if not npm_info:
             continue
         
@@ -331,12 +358,16 @@ def main():
             tarball_path = temp_path / f"{package_name.replace('/', '_')}.tgz"
             
             log_info(f"正在下载: {tarball_url}")
-            if not download_npm_package(tarball_url, tarball_path):
+            with metrics.stage("download"):
+                downloaded = download_npm_package(tarball_url, tarball_path, npm_info.get("dist"))
+            if not downloaded:
                 continue
             
             # 解压包
             log_info("正在解压...")
-            if not extract_tarball(tarball_path, temp_path):
+            with metrics.stage("extract"):
+                extracted = extract_tarball(tarball_path, temp_path)
+            if not extracted:
                 continue
             
             # 找到解压后的目录 (通常是 'package')
@@ -352,7 +383,8 @@ def main():
             
             # 分析组件结构
             log_info("正在分析组件结构...")
-            analysis = analyze_component_structure(package_dir)
+            with metrics.stage("analyze"), AnalysisPool(args.jobs) as pool:
+                analysis = analyze_component_structure(package_dir, pool)
             
             # 复制到输出目录
             output_package_dir = COMPONENTS_OUTPUT_DIR / package_name.replace('/', '_').replace('@', '')
@@ -374,8 +406,12 @@ def main():
         
         time.sleep(REQUEST_DELAY)
     
+    metrics_path = METRICS_DIR / "fetch_ibest_ui.json"
+    metrics.write(metrics_path, prometheus=METRICS_PROMETHEUS)
+    
     log_info("\n" + "=" * 60)
     log_success("IBest-UI 抓取完成!")
+    log_info(f"指标报告: {metrics_path}")
     log_info("=" * 60)
 
 
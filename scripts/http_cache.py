@@ -0,0 +1,310 @@
+"""
+HarmonyOS NEXT UI/UX Pro Max Skill - HTTP 响应缓存
+各抓取脚本共用的磁盘缓存，使用 ETag / Last-Modified 条件请求重新验证
+"""
+
+import os
+import json
+import atexit
+import gzip
+import shutil
+import hashlib
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# 已压缩的内容类型不再二次压缩
+INCOMPRESSIBLE_TYPES = (
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-tar",
+    "application/octet-stream",
+    "image/",
+    "video/",
+    "audio/",
+)
+
+# 随缓存条目保存的响应头
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+CHUNK_SIZE = 64 * 1024
+
+# 索引写回: 累计这么多次更新，或距上次写回超过这么多秒时写入 index.json
+INDEX_FLUSH_EVERY = 100
+INDEX_FLUSH_INTERVAL = 10.0
+
+
+class HttpCache:
+    """
+    内容寻址的 HTTP 响应缓存
+
+    响应体按 SHA-256 存放于 bodies/<前两位>/<哈希>[.gz]，相同内容只存一份；
+    URL -> 元数据 (验证器、响应头、哈希) 存放于 index.json。URL 的内容变化后，
+    不再被任何条目引用的旧响应体立即删除。索引按批写回 (见 INDEX_FLUSH_EVERY)，
+    进程退出或会话关闭时写入剩余的更新。
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Args:
+            cache_dir: 缓存目录
+        """
+        self.cache_dir = cache_dir
+        self.bodies_dir = cache_dir / "bodies"
+        self.index_path = cache_dir / "index.json"
+        self._lock = threading.Lock()
+        self.index: Dict[str, Dict] = {}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+        # 响应体路径 -> 引用它的条目数
+        self._refs = Counter(self._body_path(entry) for entry in self.index.values())
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+        atexit.register(self.flush)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """
+        查找缓存条目 (响应体文件缺失时视为未命中)
+
+        Args:
+            url: 完整 URL (含查询参数)
+
+        Returns:
+            缓存条目或 None
+        """
+        entry = self.index.get(url)
+        if entry and self._body_path(entry).exists():
+            return entry
+        return None
+
+    def _body_path(self, entry: Dict) -> Path:
+        suffix = ".gz" if entry.get("encoding") == "gzip" else ""
+        sha = entry["sha256"]
+        return self.bodies_dir / sha[:2] / f"{sha}{suffix}"
+
+    def open_body(self, entry: Dict):
+        """打开缓存的响应体 (返回解压后的二进制文件对象)"""
+        path = self._body_path(entry)
+        if entry.get("encoding") == "gzip":
+            return gzip.open(path, 'rb')
+        return open(path, 'rb')
+
+    def store(self, url: str, response: requests.Response, stream: bool = False) -> Dict:
+        """
+        保存响应到缓存
+
+        Args:
+            url: 完整 URL
+            response: 状态为 200 的响应
+            stream: 响应体尚未读取 (流式下载)，边读边写入磁盘
+
+        Returns:
+            新的缓存条目
+        """
+        chunks = response.iter_content(chunk_size=CHUNK_SIZE) if stream else [response.content]
+        return self._store_chunks(url, chunks, response.headers)
+
+    def store_file(self, url: str, path: Path, headers: Dict[str, str]) -> Dict:
+        """
+        将已下载完成的文件登记为 URL 的缓存 (如分段下载的结果)
+
+        Args:
+            url: 完整 URL
+            path: 文件路径
+            headers: 该 URL 的响应头 (含 ETag / Last-Modified)
+
+        Returns:
+            新的缓存条目
+        """
+        def chunks():
+            with open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+
+        return self._store_chunks(url, chunks(), CaseInsensitiveDict(headers))
+
+    def _store_chunks(self, url: str, chunks, headers) -> Dict:
+        """写入响应体并更新索引"""
+        content_type = headers.get("Content-Type", "")
+        compress = not any(content_type.startswith(t) for t in INCOMPRESSIBLE_TYPES)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as raw_file:
+                out = gzip.GzipFile(fileobj=raw_file, mode='wb', compresslevel=6) if compress else raw_file
+                for chunk in chunks:
+                    if chunk:
+                        digest.update(chunk)
+                        out.write(chunk)
+                        size += len(chunk)
+                if compress:
+                    out.close()
+
+            entry = {
+                "sha256": digest.hexdigest(),
+                "encoding": "gzip" if compress else "identity",
+                "size": size,
+                "headers": {k: headers[k] for k in STORED_HEADERS if k in headers},
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "stored_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            body_path = self._body_path(entry)
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            # 放入响应体与更新引用计数在同一把锁内，避免刚放入的响应体被当作无引用删除
+            with self._lock:
+                if body_path.exists():
+                    os.unlink(tmp_name)
+                else:
+                    shutil.move(tmp_name, body_path)
+                old_entry = self.index.get(url)
+                self.index[url] = entry
+                self._refs[body_path] += 1
+                if old_entry is not None:
+                    self._release(self._body_path(old_entry))
+                self._pending += 1
+                if (self._pending >= INDEX_FLUSH_EVERY
+                        or time.monotonic() - self._flushed_at >= INDEX_FLUSH_INTERVAL):
+                    self._save_index()
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        return entry
+
+    def _release(self, body_path: Path) -> None:
+        """减少响应体的引用计数，不再被引用时删除 (调用方持有锁)"""
+        self._refs[body_path] -= 1
+        if self._refs[body_path] <= 0:
+            del self._refs[body_path]
+            try:
+                body_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def flush(self) -> None:
+        """写入尚未保存的索引更新"""
+        with self._lock:
+            if self._pending:
+                self._save_index()
+
+    def _save_index(self) -> None:
+        """原子写入索引 (调用方持有锁)"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+
+class CachedSession(requests.Session):
+    """
+    带磁盘缓存的 requests 会话
+
+    对有缓存的 GET 请求附带 If-None-Match / If-Modified-Since，服务器返回 304 时
+    直接用缓存内容构造 200 响应；响应的 from_cache 属性标记是否来自缓存。
+    非 GET 请求以及没有验证器的响应不缓存；cache=False 的请求绕过缓存 (如大体积压缩包)。
+    """
+
+    def __init__(self, cache: HttpCache):
+        super().__init__()
+        self.cache = cache
+
+    def request(self, method, url, params=None, headers=None, stream=False, cache=True, **kwargs):
+        if method.upper() != "GET" or not cache:
+            return super().request(method, url, params=params, headers=headers, stream=stream, **kwargs)
+
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        entry = self.cache.lookup(full_url)
+
+        headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().request(method, url, params=params, headers=headers, stream=True, **kwargs)
+
+        if response.status_code == 304 and entry:
+            response.close()
+            return self._cached_response(entry, response, stream)
+
+        has_validator = "ETag" in response.headers or "Last-Modified" in response.headers
+        if response.status_code == 200 and has_validator:
+            entry = self.cache.store(full_url, response, stream=stream)
+            if stream:
+                response.close()
+                cached = self._cached_response(entry, response, stream)
+                cached.from_cache = False
+                return cached
+
+        if not stream:
+            response.content  # 与普通会话一致: 非流式请求读取完整响应体
+        response.from_cache = False
+        return response
+
+    def close(self):
+        """关闭会话并写入缓存索引"""
+        self.cache.flush()
+        super().close()
+
+    def _cached_response(self, entry: Dict, origin: requests.Response, stream: bool) -> requests.Response:
+        """用缓存条目构造 200 响应"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = origin.url
+        response.request = origin.request
+        response.connection = origin.connection
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.headers["Content-Length"] = str(entry.get("size", 0))
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.raw = self.cache.open_body(entry)
+        response.from_cache = True
+        if not stream:
+            response.content
+            response.raw.close()
+        return response
+
+
+def create_session(cache_dir: Path, headers: Optional[Dict] = None) -> CachedSession:
+    """
+    创建带缓存的会话
+
+    设置了 HARMONY_FIXTURE_RECORD / HARMONY_FIXTURE_REPLAY 环境变量时，
+    同时启用离线录制或回放 (见 replay.py)。
+
+    Args:
+        cache_dir: 缓存目录
+        headers: 默认请求头
+
+    Returns:
+        CachedSession
+    """
+    session = CachedSession(HttpCache(cache_dir))
+    if headers:
+        session.headers.update(headers)
+    if os.environ.get("HARMONY_FIXTURE_RECORD") or os.environ.get("HARMONY_FIXTURE_REPLAY"):
+        from replay import configure_session
+        configure_session(session)
+    return session
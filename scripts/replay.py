@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HarmonyOS NEXT UI/UX Pro Max Skill - 离线录制/回放
+
+录制: 设置环境变量 HARMONY_FIXTURE_RECORD=<夹具目录> 后运行任意抓取脚本，
+      所有经 create_session() 发出的请求及其最终响应都会写入夹具目录。
+回放: 用本脚本启动本地替身服务器，再设置 HARMONY_FIXTURE_REPLAY=<服务器地址>
+      运行抓取脚本，所有请求都会被改写到替身服务器，可配置延迟与带宽，
+      便于在离线环境中确定性地测量抓取吞吐与并发改动。
+
+Usage:
+    python replay.py serve <夹具目录> [options]
+
+Options:
+    --host          监听地址 (默认: 127.0.0.1)
+    --port          监听端口 (默认: 8780)
+    --latency       每个响应的固定延迟，秒 (默认: 0)
+    --bandwidth     每个连接的带宽上限，字节/秒，支持 k/m 后缀 (默认: 不限)
+
+Example:
+    HARMONY_FIXTURE_RECORD=fixtures/crawl python scrape_harmony_docs.py
+    python replay.py serve fixtures/crawl --latency 0.2 --bandwidth 512k
+    HARMONY_FIXTURE_REPLAY=http://127.0.0.1:8780 python scrape_harmony_docs.py
+"""
+
+import os
+import sys
+import re
+import json
+import time
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 录制 / 回放开关 (环境变量)
+RECORD_ENV = "HARMONY_FIXTURE_RECORD"
+REPLAY_ENV = "HARMONY_FIXTURE_REPLAY"
+
+DEFAULT_PORT = 8780
+
+# 不随夹具保存的响应头 (由替身服务器重新生成，或 requests 已解压)
+SKIPPED_HEADERS = {
+    "content-encoding", "content-length", "transfer-encoding",
+    "connection", "keep-alive", "set-cookie", "date", "server",
+}
+
+CHUNK_SIZE = 16 * 1024
+
+# 单段 Range 请求头: bytes=<start>-[<end>]
+RANGE_PATTERN = re.compile(r'^bytes=(\d+)-(\d*)$')
+
+
+def fixture_key(method: str, url: str, body: Optional[bytes] = None,
+                byte_range: Optional[str] = None) -> str:
+    """
+    请求在夹具中的键
+
+    Args:
+        method: 请求方法
+        url: 完整 URL (含查询参数)
+        body: 请求体 (POST 等)
+        byte_range: Range 请求头 (分段下载)
+
+    Returns:
+        "<METHOD> <URL>"，有请求体时附加其哈希，有 Range 时附加 [<Range>]
+    """
+    key = f"{method.upper()} {url}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        key += f" #{hashlib.sha256(body).hexdigest()[:16]}"
+    if byte_range:
+        key += f" [{byte_range}]"
+    return key
+
+
+class FixtureArchive:
+    """
+    夹具目录
+
+    index.json 保存 请求键 -> 状态码、响应头、响应体哈希；
+    响应体按 SHA-256 存放于 bodies/，相同内容只存一份。
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: 夹具目录
+        """
+        self.path = path
+        self.bodies_dir = path / "bodies"
+        self.index_path = path / "index.json"
+        self._lock = threading.Lock()
+        self.index: Dict[str, Dict] = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def add(self, key: str, status: int, headers: Dict[str, str], body: bytes,
+            size: Optional[int] = None) -> None:
+        """
+        保存一条响应
+
+        Args:
+            key: 请求键 (见 fixture_key)
+            status: 状态码
+            headers: 响应头
+            body: 响应体 (已解压)
+            size: 回放时的 Content-Length (默认为响应体长度；HEAD 响应为声明的长度)
+        """
+        sha = hashlib.sha256(body).hexdigest()
+        body_path = self.bodies_dir / sha
+        if not body_path.exists():
+            self.bodies_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = body_path.with_suffix(".tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, body_path)
+
+        entry = {
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in SKIPPED_HEADERS},
+            "sha256": sha,
+            "size": len(body) if size is None else size,
+        }
+        with self._lock:
+            self.index[key] = entry
+            tmp_path = self.index_path.with_suffix(".json.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.index_path)
+
+    def lookup(self, key: str) -> Optional[Tuple[Dict, Path]]:
+        """
+        查找响应
+
+        Returns:
+            (条目, 响应体路径)，未录制时为 None
+        """
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        return entry, self.bodies_dir / entry["sha256"]
+
+
+def install_recorder(session: requests.Session, archive_path: Path) -> None:
+    """
+    为会话安装录制器: 每个请求的最终响应 (含缓存命中) 写入夹具目录
+
+    Args:
+        session: 会话
+        archive_path: 夹具目录
+    """
+    archive = FixtureArchive(archive_path)
+    send_request = session.request
+
+    def request(method, url, *args, **kwargs):
+        response = send_request(method, url, *args, **kwargs)
+        origin = (response.history[0] if response.history else response).request
+        # 分段请求按 Range 分别保存，不覆盖同一 URL 的其他分段或整体响应
+        key = fixture_key(origin.method, origin.url, origin.body, origin.headers.get("Range"))
+        # 读取响应体 (流式响应读取后仍可通过 iter_content 再次迭代)
+        size = None
+        if origin.method == "HEAD":
+            size = int(response.headers.get("Content-Length") or 0)
+        archive.add(key, response.status_code, dict(response.headers), response.content, size=size)
+        return response
+
+    session.request = request
+
+
+class ReplayAdapter(HTTPAdapter):
+    """将所有请求改写到替身服务器: https://host/path -> <base>/https/host/path"""
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+        if parts.query:
+            request.url += f"?{parts.query}"
+        return super().send(request, **kwargs)
+
+
+def install_replay(session: requests.Session, base_url: str) -> None:
+    """
+    让会话的所有请求都发往替身服务器
+
+    Args:
+        session: 会话
+        base_url: 替身服务器地址，如 http://127.0.0.1:8780
+    """
+    adapter = ReplayAdapter(base_url)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+
+def configure_session(session: requests.Session) -> None:
+    """按环境变量为会话启用录制或回放 (由 create_session 调用)"""
+    replay_url = os.environ.get(REPLAY_ENV)
+    if replay_url:
+        install_replay(session, replay_url)
+    record_path = os.environ.get(RECORD_ENV)
+    if record_path:
+        install_recorder(session, Path(record_path))
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    夹具替身服务器
+
+    按录制时的请求键返回响应；支持 ETag / Last-Modified 条件请求 (304)，
+    未单独录制的 Range 请求从录制的完整响应体中截取 (206)，
+    并可为每个响应附加固定延迟、限制每个连接的带宽。
+    """
+
+    daemon_threads = True
+
+    def __init__(self, archive: FixtureArchive, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 latency: float = 0.0, bandwidth: Optional[float] = None):
+        """
+        Args:
+            archive: 夹具
+            host: 监听地址
+            port: 监听端口 (0 表示随机端口)
+            latency: 每个响应的固定延迟 (秒)
+            bandwidth: 每个连接的带宽上限 (字节/秒)，None 表示不限
+        """
+        super().__init__((host, port), ReplayHandler)
+        self.archive = archive
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """在后台线程中运行"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """替身服务器的请求处理"""
+
+    server: ReplayServer
+
+    def _original_url(self) -> str:
+        # /<scheme>/<host>/<path>?<query> -> <scheme>://<host>/<path>?<query>
+        scheme, _, rest = self.path.lstrip('/').partition('/')
+        return f"{scheme}://{rest}"
+
+    def _handle(self, send_body: bool = True):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        url = self._original_url()
+        byte_range = self.headers.get("Range")
+        key = fixture_key(self.command, url, body, byte_range)
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        found = self.server.archive.lookup(key)
+        if found is None and byte_range:
+            whole = self.server.archive.lookup(fixture_key(self.command, url, body))
+            if whole is not None and whole[0]["status"] == 200:
+                self.server.hits += 1
+                self._send_range(whole[0], whole[1], byte_range, send_body)
+                return
+        if found is None:
+            self.server.misses += 1
+            message = f"no fixture for {key}\n".encode('utf-8')
+            self.send_response(404)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(message)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(message)
+            return
+
+        self.server.hits += 1
+        entry, body_path = found
+        headers = entry["headers"]
+        if self._not_modified(headers):
+            self.send_response(304)
+            for name in ("ETag", "Last-Modified"):
+                if name in headers:
+                    self.send_header(name, headers[name])
+            self.end_headers()
+            return
+
+        self.send_response(entry["status"])
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(entry["size"]))
+        self.end_headers()
+        if send_body:
+            self._send_file(body_path)
+
+    def _send_range(self, entry: Dict, body_path: Path, byte_range: str, send_body: bool):
+        """从完整响应体中截取 Range 指定的字节 (206)，范围无效时返回 416"""
+        size = entry["size"]
+        match = RANGE_PATTERN.match(byte_range.strip())
+        start = int(match.group(1)) if match else size
+        end = min(int(match.group(2)), size - 1) if match and match.group(2) else size - 1
+        if start > end:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(206)
+        for name, value in entry["headers"].items():
+            self.send_header(name, value)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if send_body:
+            self._send_file(body_path, start, end - start + 1)
+
+    def _not_modified(self, headers: Dict[str, str]) -> bool:
+        etag = headers.get("ETag")
+        if etag and self.headers.get("If-None-Match") == etag:
+            return True
+        last_modified = headers.get("Last-Modified")
+        return bool(last_modified) and self.headers.get("If-Modified-Since") == last_modified
+
+    def _send_file(self, path: Path, offset: int = 0, length: Optional[int] = None):
+        """发送响应体或其中一段 (按带宽上限分块发送)"""
+        bandwidth = self.server.bandwidth
+        start = time.monotonic()
+        sent = 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            while length is None or sent < length:
+                size = CHUNK_SIZE if length is None else min(CHUNK_SIZE, length - sent)
+                chunk = f.read(size)
+                if not chunk:
+                    break
+                sent += len(chunk)
+                if bandwidth:
+                    # 按累计字节数计算该块最早的发送完成时间
+                    delay = start + sent / bandwidth - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                self.wfile.write(chunk)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_size(value: str) -> float:
+    """解析带 k/m 后缀的字节数"""
+    value = value.strip().lower()
+    units = {"k": 1024, "m": 1024 * 1024}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线录制/回放替身服务器")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="用夹具启动本地替身服务器")
+    serve.add_argument("archive", help="夹具目录")
+    serve.add_argument("--host", default="127.0.0.1", help="监听地址 (默认: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"监听端口 (默认: {DEFAULT_PORT})")
+    serve.add_argument("--latency", type=float, default=0.0, help="每个响应的固定延迟，秒 (默认: 0)")
+    serve.add_argument("--bandwidth", type=parse_size, default=None,
+                       help="每个连接的带宽上限，字节/秒，支持 k/m 后缀 (默认: 不限)")
+
+    args = parser.parse_args()
+
+    archive_path = Path(args.archive)
+    if not (archive_path / "index.json").exists():
+        print(f"Error: 夹具目录不存在或为空: {archive_path}")
+        sys.exit(1)
+
+    server = ReplayServer(FixtureArchive(archive_path), args.host, args.port,
+                          latency=args.latency, bandwidth=args.bandwidth)
+    print(f"已加载 {len(server.archive.index)} 条录制响应")
+    print(f"替身服务器: {server.base_url}")
+    print(f"运行抓取脚本前设置: {REPLAY_ENV}={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\n命中 {server.hits} 次，未录制 {server.misses} 次")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
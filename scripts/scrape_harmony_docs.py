@@ -9,15 +9,32 @@ import csv
 import json
 import time
 import re
+import asyncio
+import argparse
+import tempfile
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
 from urllib.parse import urljoin, urlparse
 
-import requests
 from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 from colorama import init, Fore, Style
 
+from config import (
+    HTTP_CACHE_DIR, CRAWL_STATE_PATH, SIMHASH_INDEX_PATH, CONTENT_STORE_DIR,
+    GITHUB_TOKEN, GITHUB_REPO_INDEX_PATH, METRICS_DIR, METRICS_PROMETHEUS
+)
+from crawl_metrics import CrawlMetrics
+from crawl_state import CrawlState
+from content_store import ContentStore
+from dedupe import SimHashIndex, simhash
+from crawler import AsyncFetcher, FetchRequest, FetchResult, HostRateLimiter
+from http_cache import create_session
+
 # 初始化 colorama
 init()
 
@@ -38,7 +55,40 @@ def log_error(message: str):
 # ============== 配置 ==============
 OUTPUT_DIR = Path(__file__).parent.parent / "knowledge_base"
 REQUEST_TIMEOUT = 30
+# 同一主机两次请求的最小间隔 (秒)；不同主机之间并行
 REQUEST_DELAY = 2
+# 最大并发请求数
+MAX_CONCURRENCY = 8
+# HTML 解析进程数 (解析是 CPU 密集型，与网络抓取并行)
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# 解析进程的启动方式 (不在多线程进程中 fork)
+PARSE_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+# 待解析页面队列上限 (超出时暂停抓取)
+PARSE_QUEUE_SIZE = MAX_CONCURRENCY * 2
+# GitHub 仓库搜索: 多个查询并发分页，结果按仓库 id 去重
+GITHUB_SEARCH_QUERIES = [
+    "HarmonyOS ArkUI",
+    "ArkUI component",
+    "HarmonyOS NEXT",
+    "ArkTS",
+    "OpenHarmony UI",
+]
+GITHUB_SEARCH_PER_PAGE = 100
+# Search API 最多返回前 1000 条结果
+GITHUB_SEARCH_MAX_PAGES = 10
+# 每轮最多为新增/更新的仓库获取多少个 README (其余留到下一轮)
+GITHUB_MAX_README_FETCHES = 50
+# Search API 的独立配额: 每分钟 30 次 (带 token) / 10 次 (匿名)
+GITHUB_SEARCH_PER_MINUTE = 30 if GITHUB_TOKEN else 10
+
+# README 摘要长度
+README_EXCERPT_LENGTH = 2000
+# 抓取状态中代表整个 GitHub 搜索的键
+GITHUB_STATE_KEY = "github:search/repositories"
+
+GITHUB_API_HEADERS = {"Accept": "application/vnd.github+json"}
+if GITHUB_TOKEN:
+    GITHUB_API_HEADERS["Authorization"] = f"Bearer {GITHUB_TOKEN}"
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -57,6 +107,64 @@ KNOWLEDGE_SOURCES = {
     ]
 }
 
+# 导出 CSV 的列 (content/code_example 为摘要，完整正文见 content_ref；deleted_at 非空表示墓碑行；
+# missed_runs 为该 URL 连续未出现在抓取结果中的运行次数)
+EXPORT_FIELDS = ['title', 'category', 'content', 'code_example', 'url', 'content_ref', 'scraped_at',
+                 'deleted_at', 'missed_runs']
+# 判断行是否变化时比较的列
+CONTENT_FIELDS = ['title', 'category', 'content', 'code_example', 'content_ref']
+
+# 来源返回这些状态码时直接记为墓碑
+GONE_STATUSES = (404, 410)
+# 连续这么多次运行未出现 (且未确认删除) 的 URL 记为墓碑
+MISSED_RUNS_BEFORE_DELETE = 3
+
+# CSV 摘要长度: 正文字符数、代码示例块数与单块长度范围
+SUMMARY_LENGTH = 1000
+SUMMARY_CODE_BLOCKS = 2
+SUMMARY_CODE_LENGTH = (50, 1000)
+# 用于判断分类的正文长度
+CATEGORY_TEXT_LENGTH = 2000
+
+# 分类关键词表 (同分时靠前的分类优先)；新增分类只需加一行，不增加扫描次数
+CATEGORY_KEYWORDS = {
+    'component': ['button', '按钮', 'text', '文本', 'image', '图片', 'input', '输入'],
+    'layout': ['row', 'column', 'flex', 'grid', '布局', 'layout'],
+    'style': ['color', '颜色', 'theme', '主题', '样式'],
+    'animation': ['animation', '动画', '动效', 'transition'],
+    'navigation': ['navigation', '导航', 'tab', 'router', '路由'],
+    'form': ['form', '表单', 'checkbox', 'switch', '开关'],
+}
+
+# 关键词 -> 分类，以及所有关键词合并成的单个正则 (长词优先匹配)。
+# 英文关键词只匹配完整单词 (允许复数)，避免 form 命中 platform、row 命中 browser；
+# 不用 \b，因为中文字符也属于 \w，"使用Button组件" 中的 button 两侧没有 \b。
+# 中文关键词按子串匹配。匹配到的关键词在第 1 组 (英文) 或第 2 组 (中文)。
+KEYWORD_CATEGORIES = {
+    keyword: category for category, keywords in CATEGORY_KEYWORDS.items() for keyword in keywords
+}
+_ASCII_KEYWORDS = sorted((k for k in KEYWORD_CATEGORIES if k.isascii()), key=len, reverse=True)
+_CJK_KEYWORDS = sorted((k for k in KEYWORD_CATEGORIES if not k.isascii()), key=len, reverse=True)
+CATEGORY_PATTERN = re.compile(
+    r'(?<![a-z0-9_])(' + '|'.join(map(re.escape, _ASCII_KEYWORDS)) + r')(?:e?s)?(?![a-z0-9_])'
+    r'|(' + '|'.join(map(re.escape, _CJK_KEYWORDS)) + ')'
+)
+
+
+def _class_xpath(class_name: str) -> str:
+    """CSS 类选择器对应的 XPath"""
+    return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+# 不同网站的正文容器: (CSS 选择器, 预编译的等价 XPath)，按优先级排列
+CONTENT_SELECTORS = [
+    ('article', etree.XPath('//article')),
+    ('.article-content', etree.XPath(_class_xpath('article-content'))),
+    ('.markdown-body', etree.XPath(_class_xpath('markdown-body'))),
+    ('#article_content', etree.XPath("//*[@id='article_content']")),
+    ('.post-content', etree.XPath(_class_xpath('post-content'))),
+]
+
 
 @dataclass
 class ScrapedKnowledge:
@@ -67,105 +175,669 @@ class ScrapedKnowledge:
     code_example: str
     url: str
     scraped_at: str
+    content_ref: str = ''
 
 
 class HarmonyDocsScraper:
     """华为开发者文档爬虫"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+    def __init__(self, state_path: Optional[Path] = None, dedupe_path: Optional[Path] = None,
+                 parse_workers: int = PARSE_WORKERS, github_index: bool = True,
+                 content_dir: Optional[Path] = CONTENT_STORE_DIR):
+        """
+        Args:
+            state_path: 可恢复抓取状态的数据库路径 (None 表示不持久化)
+            dedupe_path: 历史文章指纹文件路径 (None 表示只在本轮内去重)
+            content_dir: 完整正文存储目录 (None 表示 CSV 只保存摘要)
+            parse_workers: HTML 解析进程数
+            github_index: 是否使用已收录 GitHub 仓库记录 (GITHUB_REPO_INDEX_PATH) 跳过未更新的仓库
+        """
+        self.github_index = github_index
+        self.parse_workers = max(1, parse_workers)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        # 主机 -> 上次命中的正文选择器
+        self.host_selectors: Dict[str, str] = {}
+        self.session = create_session(HTTP_CACHE_DIR, HEADERS)
+        self.metrics = CrawlMetrics("scrape_harmony_docs")
+        self.metrics.instrument(self.session)
         self.knowledge_list: List[ScrapedKnowledge] = []
+        # 近似重复: (被丢弃的 URL, 保留的 URL)
+        self.duplicates: List[Tuple[str, str]] = []
+        # 本轮请求过的文章 URL (含失败与已在检查点中完成的)，以及来源确认已删除 (404/410) 的 URL
+        self.attempted: Set[str] = set()
+        self.gone: Set[str] = set()
+        self.dedup = SimHashIndex(dedupe_path)
+        self.content_store = ContentStore(content_dir) if content_dir else None
+        self.state: Optional[CrawlState] = None
+        if state_path:
+            self.state = CrawlState(state_path)
+            if self.state.resumed:
+                self.knowledge_list = [
+                    ScrapedKnowledge(**json.loads(data)) for data in self.state.load_knowledge()
+                ]
+                for item in self.knowledge_list:
+                    text = self._fingerprint_text(item)
+                    if text:
+                        self.dedup.add(item.url, simhash(text))
+                log_info(f"从检查点恢复: 已完成 {self.state.stats().get('done', 0)} 个 URL, "
+                         f"{len(self.knowledge_list)} 条知识")
+        # 来源名称 -> 适配器实例 (见 SOURCE_ADAPTERS)
+        self.sources: Dict[str, SourceAdapter] = {
+            name: adapter(self) for name, adapter in SOURCE_ADAPTERS.items()
+        }
+        # 各适配器声明的主机使用其自己的请求速率 (以及同一主机上配额独立的接口)
+        host_limits = {
+            host: (source.rate, source.burst)
+            for source in self.sources.values() for host in source.hosts
+        }
+        for source in self.sources.values():
+            host_limits.update(source.scope_limits)
+        self.rate_limiter = HostRateLimiter(1 / REQUEST_DELAY, overrides=host_limits)
+        self.fetcher = AsyncFetcher(
+            self.session, self.rate_limiter,
+            max_workers=MAX_CONCURRENCY, timeout=REQUEST_TIMEOUT,
+            metrics=self.metrics
+        )
     
     def fetch_page(self, url: str) -> Optional[str]:
         """获取网页内容"""
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            return response.text
-        except Exception as e:
-            log_warning(f"获取页面失败 {url}: {e}")
+        return asyncio.run(self._fetch_page(url))
+    
+    async def _fetch_page(self, url: str) -> Optional[str]:
+        """获取网页内容 (异步)"""
+        result = await self.fetcher.fetch(FetchRequest(url))
+        if not result.ok:
+            log_warning(f"获取页面失败 {url}: {result.error}")
             return None
+        return result.text
     
-    def scrape_segmentfault_articles(self):
-        """从 SegmentFault 抓取 HarmonyOS 相关文章"""
-        log_info("正在从 SegmentFault 抓取 HarmonyOS 文章...")
+    def scrape_sources(self, names: List[str]):
+        """
+        并发抓取多个来源
         
-        search_urls = [
-            "https://segmentfault.com/search?q=HarmonyOS+ArkUI+%E7%BB%84%E4%BB%B6",
-            "https://segmentfault.com/search?q=HarmonyOS+NEXT+%E5%B8%83%E5%B1%80",
-        ]
+        所有适配器在同一事件循环中运行，共享抓取线程池 (总并发 MAX_CONCURRENCY)；
+        每个适配器的并发数与主机请求速率由其自身声明，新增来源不会线性延长抓取时间。
         
-        for url in search_urls:
-            html = self.fetch_page(url)
-            if not html:
-                continue
-            
-            soup = BeautifulSoup(html, 'lxml')
-            
-            # 查找文章列表
-            articles = soup.find_all('div', class_='list-group-item')
-            
-            for article in articles[:5]:  # 只取前5篇
-                title_elem = article.find('a', class_='title')
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    link = title_elem.get('href', '')
-                    
-                    if 'HarmonyOS' in title or 'ArkUI' in title:
-                        self._scrape_article_content(title, link, 'SegmentFault')
-            
-            time.sleep(REQUEST_DELAY)
+        Args:
+            names: 来源名称列表 (见 SOURCE_ADAPTERS)
+        """
+        async def run_all():
+            results = await asyncio.gather(
+                *(self.sources[name].run() for name in names), return_exceptions=True
+            )
+            for name, result in zip(names, results):
+                if isinstance(result, Exception):
+                    log_warning(f"{name} 抓取失败: {result}")
+        
+        asyncio.run(run_all())
+    
+    def scrape_segmentfault_articles(self):
+        """从 SegmentFault 抓取 HarmonyOS 相关文章"""
+        self.scrape_sources(["segmentfault"])
     
     def scrape_csdn_articles(self):
         """从 CSDN 抓取 HarmonyOS 相关文章"""
-        log_info("正在从 CSDN 抓取 HarmonyOS 文章...")
+        self.scrape_sources(["csdn"])
+    
+    def scrape_juejin_articles(self):
+        """从掘金抓取 HarmonyOS 相关文章"""
+        self.scrape_sources(["juejin"])
+    
+    def scrape_github_awesome_list(self):
+        """从 GitHub Awesome 列表抓取资源"""
+        self.scrape_sources(["github"])
+    
+    async def _scrape_articles(self, articles: List[Tuple[str, str]], source: "SourceAdapter"):
+        """
+        并发抓取一批文章并提取知识
+        
+        Args:
+            articles: (标题, URL) 列表
+            source: 文章所属的来源适配器 (决定并发数与解析函数)
+        """
+        articles = [(title, url) for title, url in articles if url.startswith('http')]
+        pending = []
+        for title, url in articles:
+            if self._is_done(url):
+                self.attempted.add(url)
+                log_info(f"  跳过 (已完成): {title[:40]}...")
+                continue
+            if self.state:
+                self.state.add(url, source.name, title)
+            log_info(f"  抓取: {title[:40]}...")
+            pending.append((title, url))
         
-        # CSDN HarmonyOS 专区
-        search_url = "https://so.csdn.net/so/search?q=HarmonyOS%20NEXT%20ArkUI&t=blog"
+        # 抓取阶段 -> 有界队列 -> 解析阶段 (进程池)
+        # 队列满时抓取暂停，避免下载远快于解析时页面堆积在内存中
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PARSE_QUEUE_SIZE)
         
-        html = self.fetch_page(search_url)
-        if not html:
+        async def fetch_stage():
+            await self.fetcher.fetch_all(
+                (FetchRequest(url, meta={"title": title}) for title, url in pending),
+                on_result=queue.put, concurrency=source.concurrency
+            )
+            for _ in range(self.parse_workers):
+                await queue.put(None)
+        
+        async def parse_stage():
+            while True:
+                result = await queue.get()
+                if result is None:
+                    return
+                await self._parse_result(result, source)
+        
+        await asyncio.gather(fetch_stage(), *(parse_stage() for _ in range(self.parse_workers)))
+        
+        if self.state:
+            self.state.checkpoint()
+    
+    async def _parse_result(self, result: FetchResult, source: "SourceAdapter"):
+        """在进程池中解析抓取结果并记录知识"""
+        url = result.request.url
+        self.attempted.add(url)
+        if not result.ok:
+            log_warning(f"获取页面失败 {url}: {result.error}")
+            response = getattr(result.error, 'response', None)
+            if response is not None and response.status_code in GONE_STATUSES:
+                self.gone.add(url)
+            if self.state:
+                self.state.mark_failed(url)
             return
         
-        soup = BeautifulSoup(html, 'lxml')
+        title = result.request.meta["title"]
+        host = urlparse(url).netloc
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            parsed = await loop.run_in_executor(
+                self._get_parse_pool(), source.extract,
+                title, result.text, self.host_selectors.get(host)
+            )
+        except Exception as e:
+            log_warning(f"解析页面失败 {url}: {e}")
+            if self.state:
+                self.state.mark_failed(url)
+            return
+        finally:
+            self.metrics.record_stage("parse", time.perf_counter() - start)
         
-        # 查找搜索结果
-        results = soup.find_all('div', class_='limit_width')
+        if parsed:
+            content, code_blocks, category, selector = parsed
+            self.host_selectors[host] = selector
+            content_summary, code_example = summarize_article(content, code_blocks)
+            knowledge = ScrapedKnowledge(
+                title=title,
+                category=category,
+                content=content_summary,
+                code_example=code_example,
+                url=url,
+                scraped_at=time.strftime('%Y-%m-%d %H:%M:%S')
+            )
+            body = {"title": title, "content": content, "code_blocks": code_blocks}
+            if self._add_knowledge(knowledge, body):
+                log_success(f"  已提取: {title[:30]}... [{category}]")
+        if self.state:
+            self.state.mark_done(url)
+    
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """
+        解析进程池 (首次使用时创建)
         
-        for result in results[:5]:
-            title_elem = result.find('a')
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-                link = title_elem.get('href', '')
-                
-                if link and ('HarmonyOS' in title or 'ArkUI' in title or '鸿蒙' in title):
-                    self._scrape_article_content(title, link, 'CSDN')
+        创建时抓取线程池已在运行并可能持有锁 (连接池、日志等)，直接 fork 的子进程
+        可能死锁，因此用 forkserver (不支持时用 spawn) 启动工作进程。
+        """
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers, mp_context=multiprocessing.get_context(PARSE_START_METHOD)
+            )
+        return self._parse_pool
+    
+    def close(self):
+        """释放抓取线程池、解析进程池与状态数据库"""
+        self.fetcher.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True)
+            self._parse_pool = None
+        if self.state:
+            self.state.close()
+    
+    def _is_done(self, url: str) -> bool:
+        """URL 是否已在本轮 (含被中断的上一次运行) 中完成"""
+        return self.state is not None and self.state.is_done(url)
+    
+    @staticmethod
+    def _fingerprint_text(knowledge: ScrapedKnowledge) -> str:
+        """用于近似重复检测的文本 (正文 + 代码示例)"""
+        return f"{knowledge.content}\n{knowledge.code_example}".strip()
+    
+    def _add_knowledge(self, knowledge: ScrapedKnowledge, body: Optional[Dict] = None) -> bool:
+        """
+        记录一条知识 (并写入检查点)
+        
+        与本轮或历史文章近似重复 (常见于各社区转载) 时丢弃。
         
-        time.sleep(REQUEST_DELAY)
+        Args:
+            knowledge: 知识 (content/code_example 为 CSV 摘要)
+            body: 完整正文 (title、content、code_blocks)，写入正文存储并设置 content_ref
+        
+        Returns:
+            是否已记录 (近似重复时为 False)
+        """
+        duplicate_of = self.dedup.check(knowledge.url, self._fingerprint_text(knowledge))
+        if duplicate_of:
+            self.duplicates.append((knowledge.url, duplicate_of))
+            log_info(f"  跳过近似重复: {knowledge.title[:30]}... (同 {duplicate_of})")
+            return False
+        
+        if body is not None and self.content_store is not None:
+            knowledge.content_ref = self.content_store.put(knowledge.url, body)
+        self.knowledge_list.append(knowledge)
+        if self.state:
+            self.state.save_knowledge(knowledge.url, json.dumps(asdict(knowledge), ensure_ascii=False))
+        return True
     
-    def scrape_juejin_articles(self):
-        """从掘金抓取 HarmonyOS 相关文章"""
-        log_info("正在从掘金抓取 HarmonyOS 文章...")
+    def export_to_csv(self, output_path: Path, summary_path: Optional[Path] = None) -> Dict:
+        """
+        增量合并导出知识到 CSV
+        
+        以 URL 为键与已有文件合并: 新 URL 追加，内容变化的行更新，未变化的行保持原样
+        (包括 scraped_at)。只在有明确证据时记为墓碑 (deleted_at 非空): 来源返回 404/410，
+        或本轮抓取到的主机下连续 MISSED_RUNS_BEFORE_DELETE 次运行未再出现 (如掉出搜索结果)。
+        请求失败、被判为近似重复的 URL 不计入未出现次数；其他主机的行不受影响。
+        墓碑行的完整正文保留在正文存储中，URL 再次出现时恢复。
+        通过临时文件 + 重命名原子写入，并生成变更摘要供下游索引重建使用。
+        
+        Args:
+            output_path: CSV 文件路径
+            summary_path: 变更摘要 JSON 路径 (默认与 CSV 同名，后缀 .changes.json)
+        
+        Returns:
+            变更摘要
+        """
+        if not self.knowledge_list:
+            log_warning("没有爬取到任何知识")
+            if not output_path.exists():
+                return {}
+            # 仍与已有文件合并，以便把本轮返回 404/410 的条目记为墓碑
+        
+        summary_path = summary_path or output_path.with_suffix(".changes.json")
+        now = time.strftime('%Y-%m-%d %H:%M:%S')
+        
+        rows: Dict[str, Dict] = {}
+        if output_path.exists():
+            with open(output_path, 'r', newline='', encoding='utf-8-sig') as f:
+                for row in csv.DictReader(f):
+                    rows[row['url']] = {field: row.get(field) or '' for field in EXPORT_FIELDS}
+        
+        added, updated, restored, deleted = [], [], [], []
+        missed_changed = False
+        seen = set()
+        for item in self.knowledge_list:
+            if item.url in seen:
+                continue
+            seen.add(item.url)
+            new_row = dict(asdict(item), deleted_at='', missed_runs='')
+            old_row = rows.get(item.url)
+            if old_row is None:
+                added.append(item.url)
+            elif old_row['deleted_at']:
+                restored.append(item.url)
+            elif any(old_row[field] != new_row[field] for field in CONTENT_FIELDS):
+                updated.append(item.url)
+            elif old_row['missed_runs']:
+                # 内容未变，只清零未出现次数
+                missed_changed = True
+                old_row['missed_runs'] = ''
+                continue
+            else:
+                continue
+            rows[item.url] = new_row
+        
+        # 只对本轮实际抓取到的主机计数；请求过 (失败或近似重复) 的 URL 不算未出现
+        crawled_hosts = {urlparse(url).netloc for url in seen}
+        present = self.attempted | {url for url, _ in self.duplicates}
+        for url, row in rows.items():
+            if url in seen or row['deleted_at']:
+                continue
+            if url not in self.gone:
+                if url in present or urlparse(url).netloc not in crawled_hosts:
+                    continue
+                missed_runs = int(row['missed_runs'] or 0) + 1
+                row['missed_runs'] = str(missed_runs)
+                missed_changed = True
+                if missed_runs < MISSED_RUNS_BEFORE_DELETE:
+                    continue
+            row['deleted_at'] = now
+            deleted.append(url)
+            self.dedup.remove(url)
+        
+        summary = {
+            "generated_at": now,
+            "output": str(output_path),
+            "added": added,
+            "updated": updated,
+            "restored": restored,
+            "deleted": deleted,
+            "duplicates": [{"url": url, "duplicate_of": kept} for url, kept in self.duplicates],
+            "unchanged": len(seen) - len(added) - len(updated) - len(restored),
+            "active": sum(1 for row in rows.values() if not row['deleted_at']),
+        }
+        
+        changed = added or updated or restored or deleted or missed_changed
+        if changed or not output_path.exists():
+            write_csv_atomic(output_path, EXPORT_FIELDS, rows.values())
+        write_json_atomic(summary_path, summary)
+        self.dedup.save()
+        
+        log_success(f"已导出知识到: {output_path} (新增 {len(added)}, 更新 {len(updated)}, "
+                    f"恢复 {len(restored)}, 删除 {len(deleted)}, 未变 {summary['unchanged']})")
+        return summary
+
+
+def parse_article(title: str, html: str,
+                  preferred_selector: Optional[str] = None) -> Optional[Tuple[str, List[str], str, str]]:
+    """
+    从文章 HTML 中提取知识 (在解析进程池中执行，须为模块级函数)
+    
+    先用 lxml 构建轻量树并按 XPath 定位正文容器，只把命中的容器交给
+    BeautifulSoup 提取文本与代码块，避免为整页构建 BeautifulSoup 树；
+    lxml 无法解析时退回整页 BeautifulSoup 解析。
+    
+    Args:
+        title: 文章标题
+        html: 文章 HTML
+        preferred_selector: 优先尝试的选择器 (同一站点上次命中的选择器)
+    
+    Returns:
+        (完整正文, 全部代码块, 分类, 命中的选择器)，未找到正文时为 None；
+        CSV 摘要由 summarize_article 生成
+    """
+    selectors = sorted(CONTENT_SELECTORS, key=lambda item: item[0] != preferred_selector)
+    
+    content_elem = None
+    matched = None
+    try:
+        tree = lxml_html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        tree = None
+    
+    if tree is not None:
+        for selector, xpath in selectors:
+            nodes = xpath(tree)
+            if nodes:
+                fragment = lxml_html.tostring(nodes[0], encoding='unicode', with_tail=False)
+                content_elem = BeautifulSoup(fragment, 'lxml').find(nodes[0].tag)
+                matched = selector
+                break
+    else:
+        soup = BeautifulSoup(html, 'lxml')
+        for selector, _ in selectors:
+            content_elem = soup.select_one(selector)
+            if content_elem:
+                matched = selector
+                break
+    
+    if content_elem is None:
+        return None
+    
+    # 提取文本
+    content = content_elem.get_text(separator='\n', strip=True)
+    if not content:
+        return None
+    
+    # 提取代码块 (保留原有换行与缩进)
+    code_blocks = []
+    for code in content_elem.find_all('code'):
+        code_text = code.get_text().strip()
+        if code_text and code_text not in code_blocks:
+            code_blocks.append(code_text)
+    
+    return (
+        content,
+        code_blocks,
+        determine_category(title, content[:CATEGORY_TEXT_LENGTH]),
+        matched,
+    )
+
+
+def summarize_article(content: str, code_blocks: List[str]) -> Tuple[str, str]:
+    """
+    生成写入 CSV 的摘要
+    
+    Args:
+        content: 完整正文
+        code_blocks: 全部代码块
+    
+    Returns:
+        (正文摘要, 代码示例摘要)
+    """
+    min_length, max_length = SUMMARY_CODE_LENGTH
+    code_examples = [
+        code for code in code_blocks[:SUMMARY_CODE_BLOCKS + 1]
+        if min_length < len(code) < max_length
+    ]
+    return content[:SUMMARY_LENGTH], '\n---\n'.join(code_examples[:SUMMARY_CODE_BLOCKS])
+
+
+def determine_category(title: str, content: str) -> str:
+    """
+    根据标题和内容确定分类
+    
+    一次扫描统计各分类的关键词命中次数，取得分最高的分类；
+    同分时按 CATEGORY_KEYWORDS 中的顺序，没有命中时为 general。
+    
+    >>> determine_category('ArkUI 按钮组件', 'Button 按钮 ... platform ... performance; information ... transform')
+    'component'
+    >>> determine_category('HarmonyOS 使用Row和Column实现弹性布局', '在 browser 中 throw 的 arrow 函数')
+    'layout'
+    >>> determine_category('鸿蒙开发：Navigation 组件实现页面路由跳转', 'NavDestination 与 router 的区别')
+    'navigation'
+    >>> determine_category('ArkTS 表单校验：Checkbox 与 Toggle 开关', 'form 表单提交')
+    'form'
+    >>> determine_category('HarmonyOS 应用性能优化实践', 'platform performance information')
+    'general'
+    """
+    scores = dict.fromkeys(CATEGORY_KEYWORDS, 0)
+    for match in CATEGORY_PATTERN.finditer(f"{title}\n{content}".lower()):
+        scores[KEYWORD_CATEGORIES[match.group(1) or match.group(2)]] += 1
+    
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else 'general'
+
+
+def write_csv_atomic(path: Path, fields: List[str], rows) -> None:
+    """
+    原子写入 CSV (先写同目录临时文件，再重命名覆盖)
+    
+    Args:
+        path: 目标路径
+        fields: 列名
+        rows: 行字典序列
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def load_json(path: Path) -> Dict:
+    """读取 JSON 文件 (不存在或损坏时返回空字典)"""
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json_atomic(path: Path, data: Dict) -> None:
+    """原子写入 JSON 文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+# ============== 来源适配器 ==============
+# 来源名称 -> 适配器类 (通过 @register_source 注册)
+SOURCE_ADAPTERS: Dict[str, type] = {}
+
+
+def register_source(adapter: type) -> type:
+    """注册来源适配器 (类装饰器)"""
+    SOURCE_ADAPTERS[adapter.name] = adapter
+    return adapter
+
+
+class SourceAdapter:
+    """
+    来源适配器: discover (发现文章) -> fetch (抓取页面) -> extract (解析正文)
+    
+    子类声明来源名称、所属主机及自己的并发数与请求速率，并实现 discover()；
+    抓取与解析由 HarmonyDocsScraper 的公共流水线完成。
+    """
+    
+    # 注册名 (命令行 --sources 使用)
+    name = ""
+    # 日志中显示的名称
+    label = ""
+    # 该来源请求的主机 (按下方速率限速)
+    hosts: Tuple[str, ...] = ()
+    # 同时在途的文章请求数上限
+    concurrency = 4
+    # 每台主机每秒请求数与突发请求数
+    rate = 1 / REQUEST_DELAY
+    burst = 1.0
+    # 同一主机上配额独立的接口: "主机/路径前缀" -> (每秒请求数, 突发请求数)
+    scope_limits: Dict[str, Tuple[float, float]] = {}
+    # 解析函数 (在进程池中执行，须为模块级函数)
+    extract = staticmethod(parse_article)
+    
+    def __init__(self, scraper: HarmonyDocsScraper):
+        self.scraper = scraper
+    
+    async def discover(self) -> List[Tuple[str, str]]:
+        """
+        发现待抓取的文章
         
+        Returns:
+            (标题, URL) 列表
+        """
+        raise NotImplementedError
+    
+    async def run(self):
+        """执行完整流程"""
+        log_info(f"正在从 {self.label} 抓取 HarmonyOS 文章...")
+        articles = await self.discover()
+        await self.scraper._scrape_articles(articles, self)
+    
+    async def fetch_search_pages(self, urls: List[str]) -> List[BeautifulSoup]:
+        """并发抓取搜索结果页并解析 (失败的页面跳过)"""
+        pages = []
+        for result in await self.scraper.fetcher.fetch_all(FetchRequest(url) for url in urls):
+            if not result.ok:
+                log_warning(f"获取页面失败 {result.request.url}: {result.error}")
+                continue
+            pages.append(BeautifulSoup(result.text, 'lxml'))
+        return pages
+
+
+@register_source
+class SegmentFaultSource(SourceAdapter):
+    """SegmentFault 搜索结果"""
+    
+    name = "segmentfault"
+    label = "SegmentFault"
+    hosts = ("segmentfault.com",)
+    
+    SEARCH_URLS = [
+        "https://segmentfault.com/search?q=HarmonyOS+ArkUI+%E7%BB%84%E4%BB%B6",
+        "https://segmentfault.com/search?q=HarmonyOS+NEXT+%E5%B8%83%E5%B1%80",
+    ]
+    
+    async def discover(self) -> List[Tuple[str, str]]:
+        articles = []
+        for soup in await self.fetch_search_pages(self.SEARCH_URLS):
+            # 查找文章列表
+            for article in soup.find_all('div', class_='list-group-item')[:5]:  # 只取前5篇
+                title_elem = article.find('a', class_='title')
+                if title_elem:
+                    title = title_elem.get_text(strip=True)
+                    # 搜索结果中的链接是站内相对路径
+                    link = urljoin("https://segmentfault.com/", title_elem.get('href', ''))
+                    
+                    if 'HarmonyOS' in title or 'ArkUI' in title:
+                        articles.append((title, link))
+        return articles
+
+
+@register_source
+class CsdnSource(SourceAdapter):
+    """CSDN 博客搜索结果"""
+    
+    name = "csdn"
+    label = "CSDN"
+    hosts = ("so.csdn.net", "blog.csdn.net")
+    
+    SEARCH_URLS = ["https://so.csdn.net/so/search?q=HarmonyOS%20NEXT%20ArkUI&t=blog"]
+    
+    async def discover(self) -> List[Tuple[str, str]]:
+        articles = []
+        for soup in await self.fetch_search_pages(self.SEARCH_URLS):
+            # 查找搜索结果
+            for result in soup.find_all('div', class_='limit_width')[:5]:
+                title_elem = result.find('a')
+                if title_elem:
+                    title = title_elem.get_text(strip=True)
+                    link = title_elem.get('href', '')
+                    
+                    if link and ('HarmonyOS' in title or 'ArkUI' in title or '鸿蒙' in title):
+                        articles.append((title, link))
+        return articles
+
+
+@register_source
+class JuejinSource(SourceAdapter):
+    """掘金搜索 API"""
+    
+    name = "juejin"
+    label = "掘金"
+    hosts = ("api.juejin.cn", "juejin.cn")
+    
+    async def discover(self) -> List[Tuple[str, str]]:
         # 掘金 API 搜索
-        api_url = "https://api.juejin.cn/search_api/v1/search"
+        result = await self.scraper.fetcher.fetch(FetchRequest(
+            "https://api.juejin.cn/search_api/v1/search",
+            method="POST",
+            json={
+                "id_type": 0,
+                "key_word": "HarmonyOS ArkUI 组件",
+                "cursor": "0",
+                "limit": 10,
+                "search_type": 2,
+                "sort_type": 0
+            }
+        ))
         
+        articles = []
         try:
-            response = self.session.post(
-                api_url,
-                json={
-                    "id_type": 0,
-                    "key_word": "HarmonyOS ArkUI 组件",
-                    "cursor": "0",
-                    "limit": 10,
-                    "search_type": 2,
-                    "sort_type": 0
-                },
-                timeout=REQUEST_TIMEOUT
-            )
-            data = response.json()
+            if not result.ok:
+                raise result.error
+            data = result.response.json()
             
             for item in data.get('data', [])[:5]:
                 result_model = item.get('result_model', {})
@@ -173,173 +845,214 @@ class HarmonyDocsScraper:
                 article_id = result_model.get('article_info', {}).get('article_id', '')
                 
                 if article_id:
-                    link = f"https://juejin.cn/post/{article_id}"
-                    self._scrape_article_content(title, link, '掘金')
-            
+                    articles.append((title, f"https://juejin.cn/post/{article_id}"))
+        
         except Exception as e:
             log_warning(f"掘金 API 请求失败: {e}")
         
-        time.sleep(REQUEST_DELAY)
+        return articles
+
+
+@register_source
+class GitHubSource(SourceAdapter):
+    """
+    GitHub 仓库搜索
     
-    def _scrape_article_content(self, title: str, url: str, source: str):
-        """抓取文章内容并提取知识"""
-        if not url.startswith('http'):
-            return
-        
-        log_info(f"  抓取: {title[:40]}...")
+    与文章类来源不同，仓库信息直接来自 API (discover 即搜索，extract 为 README)：
+    多个查询并发分页抓取，结果按仓库 id 去重。已收录且 pushed_at 未变化的仓库
+    直接复用上次的内容，只为新增或有更新的仓库获取 README。
+    """
+    
+    name = "github"
+    label = "GitHub"
+    hosts = ("api.github.com",)
+    concurrency = 8
+    # GitHub API 配额由响应的 X-RateLimit-* 头控制 (将要耗尽时等待到重置)，这里只限制突发
+    rate = 1.0
+    burst = 10.0
+    # Search API 配额按分钟计且远低于其他接口，按配额匀速发送
+    scope_limits = {"api.github.com/search": (GITHUB_SEARCH_PER_MINUTE / 60, 1.0)}
+    
+    SEARCH_URL = "https://api.github.com/search/repositories"
+    
+    async def run(self):
+        scraper = self.scraper
+        log_info("正在从 GitHub 抓取 Awesome HarmonyOS 资源...")
         
-        html = self.fetch_page(url)
-        if not html:
+        if scraper._is_done(GITHUB_STATE_KEY):
+            log_info("  跳过 (已完成): GitHub 搜索")
             return
         
-        soup = BeautifulSoup(html, 'lxml')
+        repos = await self.search_repos()
+        if not repos:
+            return
         
-        # 提取文章正文
-        content = ""
-        code_examples = []
-        
-        # 不同网站的内容选择器
-        content_selectors = [
-            'article',
-            '.article-content',
-            '.markdown-body',
-            '#article_content',
-            '.post-content',
+        registry = load_json(GITHUB_REPO_INDEX_PATH) if scraper.github_index else {}
+        stale = [
+            repo for repo in repos.values()
+            if registry.get(str(repo['id']), {}).get('pushed_at') != repo.get('pushed_at')
         ]
+        stale.sort(key=lambda repo: repo.get('stargazers_count', 0), reverse=True)
+        readmes = await self.fetch_readmes(stale[:GITHUB_MAX_README_FETCHES])
+        log_info(f"  共 {len(repos)} 个仓库，{len(stale)} 个新增或有更新，获取了 {len(readmes)} 个 README")
         
-        for selector in content_selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem:
-                # 提取文本
-                content = content_elem.get_text(separator='\n', strip=True)[:2000]
-                
-                # 提取代码块
-                code_blocks = content_elem.find_all('code')
-                for code in code_blocks[:3]:  # 最多取3个代码块
-                    code_text = code.get_text(strip=True)
-                    if len(code_text) > 50 and len(code_text) < 1000:
-                        code_examples.append(code_text)
-                break
-        
-        if content:
-            # 确定分类
-            category = self._determine_category(title, content)
+        for repo in sorted(repos.values(), key=lambda repo: repo.get('stargazers_count', 0), reverse=True):
+            repo_id = str(repo['id'])
+            if repo_id in readmes:
+                registry[repo_id] = {
+                    'full_name': repo.get('full_name', ''),
+                    'pushed_at': repo.get('pushed_at'),
+                    'readme': readmes[repo_id],
+                }
+            readme = registry.get(repo_id, {}).get('readme', '')
+            description = repo.get('description') or ''
+            content = '\n'.join(part for part in (description, readme) if part)
+            if not content:
+                continue
             
+            name = repo.get('name', '')
             knowledge = ScrapedKnowledge(
-                title=title,
-                category=category,
-                content=content[:1000],  # 限制内容长度
-                code_example='\n---\n'.join(code_examples[:2]) if code_examples else '',
-                url=url,
+                title=f"[GitHub] {name} (⭐{repo.get('stargazers_count', 0)})",
+                category='resource',
+                content=content[:SUMMARY_LENGTH],
+                code_example='',
+                url=repo.get('html_url', ''),
                 scraped_at=time.strftime('%Y-%m-%d %H:%M:%S')
             )
-            self.knowledge_list.append(knowledge)
-            log_success(f"  已提取: {title[:30]}... [{category}]")
-        
-        time.sleep(REQUEST_DELAY)
-    
-    def _determine_category(self, title: str, content: str) -> str:
-        """根据标题和内容确定分类"""
-        text = (title + content).lower()
-        
-        if any(k in text for k in ['button', '按钮', 'text', '文本', 'image', '图片', 'input', '输入']):
-            return 'component'
-        elif any(k in text for k in ['row', 'column', 'flex', 'grid', '布局', 'layout']):
-            return 'layout'
-        elif any(k in text for k in ['color', '颜色', 'theme', '主题', '样式']):
-            return 'style'
-        elif any(k in text for k in ['animation', '动画', '动效', 'transition']):
-            return 'animation'
-        elif any(k in text for k in ['navigation', '导航', 'tab', 'router', '路由']):
-            return 'navigation'
-        elif any(k in text for k in ['form', '表单', 'checkbox', 'switch', '开关']):
-            return 'form'
-        else:
-            return 'general'
+            body = {"title": knowledge.title, "content": content, "code_blocks": []}
+            if scraper._add_knowledge(knowledge, body):
+                log_success(f"  已添加: {name}")
+        
+        if scraper.github_index:
+            write_json_atomic(GITHUB_REPO_INDEX_PATH, registry)
+        if scraper.state:
+            scraper.state.add(GITHUB_STATE_KEY, self.name)
+            scraper.state.mark_done(GITHUB_STATE_KEY)
+            scraper.state.checkpoint()
     
-    def scrape_github_awesome_list(self):
-        """从 GitHub Awesome 列表抓取资源"""
-        log_info("正在从 GitHub 抓取 Awesome HarmonyOS 资源...")
+    async def search_repos(self) -> Dict[int, Dict]:
+        """
+        并发执行所有搜索查询并翻页
         
-        # 搜索 GitHub 上的 HarmonyOS 相关仓库
-        api_url = "https://api.github.com/search/repositories"
-        params = {
-            "q": "HarmonyOS ArkUI component",
-            "sort": "stars",
-            "order": "desc",
-            "per_page": 10
-        }
+        Returns:
+            仓库 id -> 仓库信息
+        """
+        fetcher = self.scraper.fetcher
         
-        try:
-            response = self.session.get(api_url, params=params, timeout=REQUEST_TIMEOUT)
-            data = response.json()
-            
-            for item in data.get('items', [])[:5]:
-                name = item.get('name', '')
-                description = item.get('description', '') or ''
-                url = item.get('html_url', '')
-                stars = item.get('stargazers_count', 0)
-                
-                if description:
-                    knowledge = ScrapedKnowledge(
-                        title=f"[GitHub] {name} (⭐{stars})",
-                        category='resource',
-                        content=description,
-                        code_example='',
-                        url=url,
-                        scraped_at=time.strftime('%Y-%m-%d %H:%M:%S')
-                    )
-                    self.knowledge_list.append(knowledge)
-                    log_success(f"  已添加: {name}")
+        def page_request(query: str, page: int) -> FetchRequest:
+            params = {
+                "q": query,
+                "sort": "stars",
+                "order": "desc",
+                "per_page": GITHUB_SEARCH_PER_PAGE,
+                "page": page,
+            }
+            return FetchRequest(self.SEARCH_URL, params=params, headers=GITHUB_API_HEADERS)
+        
+        async def search(query: str) -> List[Dict]:
+            # 第一页得到结果总数后，其余页并发抓取
+            first = await fetcher.fetch(page_request(query, 1))
+            if not first.ok:
+                log_warning(f"GitHub 搜索失败 ({query}): {first.error}")
+                return []
+            data = first.response.json()
+            items = list(data.get('items', []))
+            pages = min(math.ceil(data.get('total_count', 0) / GITHUB_SEARCH_PER_PAGE), GITHUB_SEARCH_MAX_PAGES)
             
-        except Exception as e:
-            log_warning(f"GitHub API 请求失败: {e}")
+            results = await fetcher.fetch_all(
+                (page_request(query, page) for page in range(2, pages + 1)),
+                concurrency=self.concurrency
+            )
+            for result in results:
+                if not result.ok:
+                    log_warning(f"GitHub 搜索翻页失败 ({query}): {result.error}")
+                    continue
+                items.extend(result.response.json().get('items', []))
+            return items
         
-        time.sleep(REQUEST_DELAY)
+        repos: Dict[int, Dict] = {}
+        for items in await asyncio.gather(*(search(query) for query in GITHUB_SEARCH_QUERIES)):
+            for item in items:
+                repos.setdefault(item['id'], item)
+        return repos
     
-    def export_to_csv(self, output_path: Path):
-        """导出爬取的知识到 CSV"""
-        if not self.knowledge_list:
-            log_warning("没有爬取到任何知识")
-            return
-        
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
-            fields = ['title', 'category', 'content', 'code_example', 'url', 'scraped_at']
-            writer = csv.DictWriter(f, fieldnames=fields)
-            writer.writeheader()
-            
-            for item in self.knowledge_list:
-                writer.writerow(asdict(item))
+    async def fetch_readmes(self, repos: List[Dict]) -> Dict[str, str]:
+        """
+        并发获取仓库 README (原始 Markdown)
         
-        log_success(f"已导出 {len(self.knowledge_list)} 条知识到: {output_path}")
+        Returns:
+            仓库 id -> README 摘要 (获取失败的仓库不在结果中，下一轮重试)
+        """
+        headers = dict(GITHUB_API_HEADERS, Accept="application/vnd.github.raw")
+        results = await self.scraper.fetcher.fetch_all(
+            (
+                FetchRequest(
+                    f"https://api.github.com/repos/{repo['full_name']}/readme",
+                    headers=headers, meta={"id": str(repo['id'])}
+                )
+                for repo in repos
+            ),
+            concurrency=self.concurrency
+        )
+        readmes = {}
+        for result in results:
+            if result.ok:
+                readmes[result.request.meta["id"]] = result.text[:README_EXCERPT_LENGTH]
+            elif result.error is not None and getattr(result.error, 'response', None) is not None \
+                    and result.error.response.status_code == 404:
+                # 没有 README 的仓库也记录下来，避免每轮重复请求
+                readmes[result.request.meta["id"]] = ''
+        return readmes
 
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="HarmonyOS NEXT UI/UX Pro Max Skill - 网络知识爬取")
+    parser.add_argument("--fresh", action="store_true",
+                        help="丢弃上次中断的抓取状态，从头开始")
+    parser.add_argument("--no-state", action="store_true",
+                        help="不持久化抓取状态 (不可恢复)")
+    parser.add_argument("--prometheus", action="store_true", default=METRICS_PROMETHEUS,
+                        help="同时输出 Prometheus 文本格式的指标")
+    parser.add_argument("--sources", nargs="+", choices=list(SOURCE_ADAPTERS), default=list(SOURCE_ADAPTERS),
+                        help="要抓取的来源 (默认: 全部)")
+    args = parser.parse_args()
+    
     log_info("=" * 60)
     log_info("HarmonyOS NEXT UI/UX Pro Max Skill - 网络知识爬取")
     log_info("=" * 60)
     
-    scraper = HarmonyDocsScraper()
+    if args.fresh and CRAWL_STATE_PATH.exists():
+        CRAWL_STATE_PATH.unlink()
     
-    # 从各个来源抓取知识
-    log_info("\n开始抓取网络资源...\n")
+    scraper = HarmonyDocsScraper(
+        state_path=None if args.no_state else CRAWL_STATE_PATH,
+        dedupe_path=SIMHASH_INDEX_PATH
+    )
     
-    # GitHub Awesome 列表
-    scraper.scrape_github_awesome_list()
+    # 从各个来源抓取知识 (不同来源并行，同一主机按令牌桶限速)
+    log_info("\n开始抓取网络资源...\n")
     
-    # 技术社区文章 (可能因为网站限制而失败)
-    try:
-        scraper.scrape_juejin_articles()
-    except Exception as e:
-        log_warning(f"掘金抓取失败: {e}")
+    # GitHub 仓库 + 技术社区文章 (各来源并发，部分来源可能因为网站限制而失败)
+    with scraper.metrics.stage("crawl"):
+        scraper.scrape_sources(args.sources)
     
     # 导出到 CSV
     log_info("\n正在导出知识...")
     output_path = OUTPUT_DIR / "scraped_knowledge.csv"
-    scraper.export_to_csv(output_path)
+    with scraper.metrics.stage("export"):
+        scraper.export_to_csv(output_path)
+    
+    # 本轮完整结束，下次运行重新开始
+    if scraper.state:
+        scraper.state.finish()
+    scraper.close()
+    
+    metrics_path = METRICS_DIR / "scrape_harmony_docs.json"
+    report = scraper.metrics.write(metrics_path, prometheus=args.prometheus)
+    totals = report["totals"]
+    log_info(f"请求 {totals['requests']} 次 (缓存命中率 {totals['cache_hit_ratio']:.0%}, "
+             f"重试 {totals['retries']} 次)，指标报告: {metrics_path}")
     
     # 打印统计
     log_info("\n" + "=" * 60)